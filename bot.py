@@ -10,23 +10,29 @@ from logging.handlers import RotatingFileHandler
 import asyncio
 import random
 import threading
+import functools
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
-from typing import Dict, Optional, Any, List, Tuple
-from collections import deque
+from types import MappingProxyType
+from typing import Dict, Optional, Any, List, Mapping, Sequence, Set, Tuple
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import aiohttp
 
 # Load env early for runtime config.
 load_dotenv()
 
 from storage import load_config, save_config, load_state, save_state, set_env_value
-from settings import LOG_PATH, RUNTIME_STATUS_PATH
+from settings import CONFIG_PATH, ENV_PATH, LOG_PATH, RUNTIME_STATUS_PATH, STATE_PATH
+from standings_cache import OPENF1_JSON, STANDINGS_PAIR, clear_standings_caches
 from runtime_store import (
     init_runtime_db,
     upsert_runtime_status,
@@ -253,10 +259,20 @@ STATE: Dict[str, Any] = {}
 ROLE_MAP_REACTION: Dict[str, str] = {}
 ROLE_MAP_COLOR: Dict[str, str] = {}
 ROLE_MAP_DRIVER: Dict[str, str] = {}
-COLOR_ROLE_NAMES_CACHE: set[str] = set()
+DRIVER_EMOJI_NAMES: Dict[str, str] = {}
+# Read-only views handed out by the cfg_* accessors; rebuilt with the maps
+# above so callers share them instead of copying a dict per call.
+_ROLE_MAP_VIEWS: Dict[str, Mapping[str, str]] = {}
+# Merged emoji -> role lookup used on every reaction event.
+ROLE_MAP_EMOJI: Dict[str, str] = {}
+COLOR_ROLE_NAMES_CACHE: frozenset[str] = frozenset()
+# Message ids of the notifications/colors/drivers panels (from STATE).
+TRACKED_PANEL_MESSAGE_IDS: frozenset[int] = frozenset()
 
 def _rebuild_role_caches() -> None:
-    global ROLE_MAP_REACTION, ROLE_MAP_COLOR, ROLE_MAP_DRIVER, COLOR_ROLE_NAMES_CACHE
+    global ROLE_MAP_REACTION, ROLE_MAP_COLOR, ROLE_MAP_DRIVER, ROLE_MAP_EMOJI, COLOR_ROLE_NAMES_CACHE
+    global DRIVER_EMOJI_NAMES
+    global TRACKED_PANEL_MESSAGE_IDS
     rr = CFG.get("reaction_roles") or {}
     cr = CFG.get("color_roles") or {}
     driver = ((STATE.get("driver_roles") or {}).get("emoji_to_role")) or {}
@@ -264,14 +280,149 @@ def _rebuild_role_caches() -> None:
     ROLE_MAP_REACTION = dict(rr) if isinstance(rr, dict) else {}
     ROLE_MAP_COLOR = dict(cr) if isinstance(cr, dict) else {}
     ROLE_MAP_DRIVER = dict(driver) if isinstance(driver, dict) else {}
-    COLOR_ROLE_NAMES_CACHE = set(ROLE_MAP_COLOR.values())
+    names = CFG.get("driver_emoji_names") or {}
+    DRIVER_EMOJI_NAMES = dict(names) if isinstance(names, dict) else {}
+    _ROLE_MAP_VIEWS.update(
+        reaction=MappingProxyType(ROLE_MAP_REACTION),
+        color=MappingProxyType(ROLE_MAP_COLOR),
+        driver_emoji_names=MappingProxyType(DRIVER_EMOJI_NAMES),
+    )
+    COLOR_ROLE_NAMES_CACHE = frozenset(ROLE_MAP_COLOR.values())
+    # Later maps win, so precedence matches notifications > colors > drivers.
+    ROLE_MAP_EMOJI = {
+        k: v
+        for mapping in (ROLE_MAP_DRIVER, ROLE_MAP_COLOR, ROLE_MAP_REACTION)
+        for k, v in mapping.items()
+        if v
+    }
 
-def reload_config_state() -> None:
-    global CFG, STATE
-    CFG = load_config() or {}
-    STATE = load_state() or {}
+    tracked: set[int] = set()
+    panels = STATE.get("reaction_panels") or {}
+    records = [panels.get(p) for p in ("notifications", "colors")] if isinstance(panels, dict) else []
+    records.append(STATE.get("driver_roles"))
+    for rec in records:
+        try:
+            mid = int((rec or {}).get("message_id") or 0)
+        except Exception:
+            continue
+        if mid:
+            tracked.add(mid)
+    TRACKED_PANEL_MESSAGE_IDS = frozenset(tracked)
+
+# get_prefix runs for every incoming message, so resolve it once per reload.
+COMMAND_PREFIX: str = "!"
+
+# Debounced state.json writes: a burst of mutations (e.g. running all three
+# reaction-panel setups) coalesces into one atomic write on a worker thread.
+_STATE_DIRTY: bool = False
+_STATE_FLUSH_TASK: Optional[asyncio.Task] = None
+_STATE_FLUSH_DELAY_SECONDS = 0.5
+# Held from snapshot through write by every on-loop state.json writer, so
+# writes land in snapshot order and an older snapshot can't finish last.
+_STATE_WRITE_LOCK = asyncio.Lock()
+
+def flush_state_now() -> None:
+    """Synchronously write pending STATE changes. Only for code running with
+    no event loop (import time); on the loop use `await write_state_now()`."""
+    global _STATE_DIRTY
+    if not _STATE_DIRTY:
+        return
+    _STATE_DIRTY = False
+    try:
+        save_state(STATE)
+    except Exception as e:
+        _STATE_DIRTY = True
+        logging.error(f"[State] save_state failed: {e}")
+
+async def _write_state_locked() -> bool:
+    # Caller holds _STATE_WRITE_LOCK.
+    global _STATE_DIRTY
+    if not _STATE_DIRTY:
+        return True
+    _STATE_DIRTY = False
+    # Snapshot on the loop thread so the writer never iterates the live dict.
+    snapshot = copy.deepcopy(STATE)
+    try:
+        await asyncio.to_thread(save_state, snapshot)
+    except Exception as e:
+        _STATE_DIRTY = True
+        logging.error(f"[State] save_state failed: {e}")
+        return False
+    return True
+
+async def write_state_now() -> bool:
+    """Write pending STATE changes off the loop; False if the write failed."""
+    async with _STATE_WRITE_LOCK:
+        return await _write_state_locked()
+
+async def _state_flusher() -> None:
+    while _STATE_DIRTY:
+        await asyncio.sleep(_STATE_FLUSH_DELAY_SECONDS)
+        if not await write_state_now():
+            break
+
+def schedule_state_save() -> None:
+    global _STATE_DIRTY, _STATE_FLUSH_TASK
+    _STATE_DIRTY = True
+    if _STATE_FLUSH_TASK is not None and not _STATE_FLUSH_TASK.done():
+        return
+    try:
+        _STATE_FLUSH_TASK = asyncio.get_running_loop().create_task(_state_flusher())
+    except RuntimeError:
+        # No running loop (import time / worker thread): write inline.
+        flush_state_now()
+
+_CFG_MTIME: Optional[float] = None
+_STATE_MTIME: Optional[float] = None
+
+def _file_mtime(path: str) -> Optional[float]:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+def _read_config_state_files() -> Tuple[Optional[float], Optional[float], Dict[str, Any], Dict[str, Any]]:
+    # Stat before reading so a write landing mid-reload is picked up next time.
+    cfg_mtime, state_mtime = _file_mtime(CONFIG_PATH), _file_mtime(STATE_PATH)
+    return cfg_mtime, state_mtime, load_config() or {}, load_state() or {}
+
+def _apply_config_state(cfg_mtime: Optional[float], state_mtime: Optional[float], cfg: Dict[str, Any], state: Optional[Dict[str, Any]]) -> None:
+    global CFG, STATE, COMMAND_PREFIX, _CFG_MTIME, _STATE_MTIME
+    CFG, _CFG_MTIME = cfg, cfg_mtime
+    if state is not None:
+        STATE, _STATE_MTIME = state, state_mtime
+    COMMAND_PREFIX = (CFG.get("prefix") or "!").strip() or "!"
     _rebuild_role_caches()
 
+def _config_state_changed_on_disk() -> bool:
+    return _STATE_DIRTY or _file_mtime(CONFIG_PATH) != _CFG_MTIME or _file_mtime(STATE_PATH) != _STATE_MTIME
+
+def reload_config_state() -> None:
+    # Don't let a reload from disk drop changes still waiting to be flushed.
+    flush_state_now()
+    _apply_config_state(*_read_config_state_files())
+
+async def areload_config_state() -> None:
+    """reload_config_state with the file I/O on a worker thread."""
+    # Flush and read under the write lock: no debounced write can be in flight
+    # meanwhile, so the read can't see a state.json older than memory.
+    async with _STATE_WRITE_LOCK:
+        await _write_state_locked()
+        cfg_mtime, state_mtime, cfg, state = await asyncio.to_thread(_read_config_state_files)
+    if _STATE_DIRTY:
+        # STATE was mutated while we were reading (or the flush failed); keep
+        # the in-memory copy (the flusher will persist it), take only config.
+        _apply_config_state(cfg_mtime, None, cfg, None)
+        return
+    _apply_config_state(cfg_mtime, state_mtime, cfg, state)
+
+async def areload_config_state_if_changed() -> bool:
+    """Reload config/state only when either file changed on disk."""
+    if not _config_state_changed_on_disk():
+        return False
+    await areload_config_state()
+    return True
+
 # Load once at import time
 reload_config_state()
 
@@ -357,31 +508,95 @@ async def xp_flush_loop():
             if consecutive_failures >= 3:
                 await _send_staff_alert(f"XP flush has failed {consecutive_failures} times in a row: `{e}`")
 
+# ----------------------------
+# Shared HTTP session
+# ----------------------------
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+def _json_loads(raw: bytes | str) -> Any:
+    # orjson parses API bodies straight from bytes; stdlib json is the fallback.
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+# One keep-alive pool for the periodic fetches (standings, schedule, Instagram)
+# so each poll reuses an open TLS connection instead of paying a fresh
+# handshake. Created lazily on the running loop and closed in OF1Bot.close().
+HTTP_USER_AGENT = "OF1-Discord-Bot/1.0"
+HTTP_SESSION: Optional[aiohttp.ClientSession] = None
+
+def _http_session() -> aiohttp.ClientSession:
+    global HTTP_SESSION
+    if HTTP_SESSION is None or HTTP_SESSION.closed:
+        HTTP_SESSION = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=20),
+            headers={"User-Agent": HTTP_USER_AGENT},
+            # Cache DNS for 5 minutes; the bot only ever talks to a handful of hosts.
+            connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300, keepalive_timeout=75),
+        )
+    return HTTP_SESSION
+
+# The blocking OpenF1 helpers (_openf1_get_json, token login) still run in
+# worker threads; one pooled requests.Session lets them reuse connections too.
+REQUESTS_SESSION = requests.Session()
+REQUESTS_SESSION.headers.update({"User-Agent": HTTP_USER_AGENT})
+REQUESTS_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist=(500, 502, 503, 504),
+            # Hand the final response back so the 429/503 cooldown logic in
+            # _openf1_get_json still sees it, and never sleep on Retry-After.
+            raise_on_status=False,
+            respect_retry_after_header=False,
+        ),
+    ),
+)
+
+async def _close_http_session() -> None:
+    global HTTP_SESSION
+    if HTTP_SESSION is not None and not HTTP_SESSION.closed:
+        await HTTP_SESSION.close()
+    HTTP_SESSION = None
+
 # ----------------------------
 # Instagram scrape
 # ----------------------------
 _INSTAGRAM_FAIL_COUNT: Dict[str, int] = {}
+# Bytes pattern: matched against the raw body, so the page is never decoded.
+_INSTAGRAM_SHORTCODE_RE = re.compile(rb'"shortcode":"([A-Za-z0-9_-]+)"')
+_INSTAGRAM_SCAN_WINDOW = 200_000
 
-def fetch_latest_instagram_post(username: str) -> Optional[str]:
+async def fetch_latest_instagram_post(username: str) -> Optional[str]:
     try:
         url = f"https://www.instagram.com/{username}/"
         headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(url, headers=headers, timeout=15)
-        if response.status_code != 200:
-            _INSTAGRAM_FAIL_COUNT[username] = _INSTAGRAM_FAIL_COUNT.get(username, 0) + 1
-            n = _INSTAGRAM_FAIL_COUNT[username]
-            if n >= 3:
-                logging.warning(f"[Instagram] Scraping @{username} failed {n} time(s) in a row (HTTP {response.status_code})")
-            return None
-
-        soup = BeautifulSoup(response.text, "html.parser")
-        scripts = soup.find_all("script", type="text/javascript")
-        for script in scripts:
-            if "window._sharedData" in script.text:
-                shortcode = re.search(r'"shortcode":"(.*?)"', script.text)
-                if shortcode:
-                    _INSTAGRAM_FAIL_COUNT[username] = 0
-                    return f"https://www.instagram.com/p/{shortcode.group(1)}/"
+        async with _http_session().get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as response:
+            if response.status != 200:
+                _INSTAGRAM_FAIL_COUNT[username] = _INSTAGRAM_FAIL_COUNT.get(username, 0) + 1
+                n = _INSTAGRAM_FAIL_COUNT[username]
+                if n >= 3:
+                    logging.warning(f"[Instagram] Scraping @{username} failed {n} time(s) in a row (HTTP {response.status})")
+                return None
+            body = await response.read()
+
+        # Post data lives in the window._sharedData blob when present; jump
+        # there and scan a bounded window instead of the whole page.
+        start = body.find(b"window._sharedData")
+        if start >= 0:
+            shortcode = _INSTAGRAM_SHORTCODE_RE.search(body, start, start + _INSTAGRAM_SCAN_WINDOW)
+        else:
+            shortcode = _INSTAGRAM_SHORTCODE_RE.search(body)
+        if shortcode:
+            _INSTAGRAM_FAIL_COUNT[username] = 0
+            return f"https://www.instagram.com/p/{shortcode.group(1).decode('ascii')}/"
         _INSTAGRAM_FAIL_COUNT[username] = _INSTAGRAM_FAIL_COUNT.get(username, 0) + 1
         n = _INSTAGRAM_FAIL_COUNT[username]
         if n >= 3:
@@ -398,12 +613,6 @@ def fetch_latest_instagram_post(username: str) -> Optional[str]:
 # F1 data providers
 # ----------------------------
 OPENF1_BASE = "https://api.openf1.org/v1"
-ERGAST_DRIVER_URL = "https://ergast.com/api/f1/current/driverStandings.json"
-ERGAST_CONSTRUCTOR_URL = "https://ergast.com/api/f1/current/constructorStandings.json"
-ERGAST_SCHEDULE_URL = "https://ergast.com/api/f1/current.json"
-JOLPICA_DRIVER_URL = "https://api.jolpi.ca/ergast/f1/current/driverStandings.json"
-JOLPICA_CONSTRUCTOR_URL = "https://api.jolpi.ca/ergast/f1/current/constructorStandings.json"
-JOLPICA_SCHEDULE_URL = "https://api.jolpi.ca/ergast/f1/current.json"
 
 F1_SCHEDULE_CACHE: Dict[str, Any] = {"ts": 0.0, "races": [], "fail_until": 0.0, "fail_count": 0}
 F1_REMINDER_TASK: Optional[asyncio.Task] = None
@@ -459,22 +668,16 @@ def load_f1_static_data() -> None:
         logging.error(f"[F1Data] Failed loading quiz file: {e}")
         F1_QUIZ_QUESTIONS = []
 
-def _get_json(url: str):
-    r = requests.get(url, timeout=20, headers={"User-Agent": "OF1-Discord-Bot"})
-    r.raise_for_status()
-    return r.json()
+# Standings data only moves on race weekends, so OpenF1 polls inside the TTL
+# are answered from standings_cache.OPENF1_JSON without a request.
+# config.json "standings_cache_ttl" (seconds) overrides the default.
+_STANDINGS_CACHE_TTL_SECONDS = 60.0
 
-def _get_json_any(urls: List[str], label: str = "api") -> Dict[str, Any]:
-    last_exc: Optional[Exception] = None
-    for url in urls:
-        try:
-            return _get_json(url)
-        except Exception as e:
-            last_exc = e
-            logging.warning(f"[F1] {label} fetch failed for {url}: {e}")
-    if last_exc:
-        raise last_exc
-    raise RuntimeError(f"No {label} URLs configured.")
+def _standings_cache_ttl() -> float:
+    try:
+        return max(0.0, float(CFG.get("standings_cache_ttl", _STANDINGS_CACHE_TTL_SECONDS)))
+    except Exception:
+        return _STANDINGS_CACHE_TTL_SECONDS
 
 _OPENF1_TOKEN_CACHE: Dict[str, Any] = {"token": "", "expires_at": 0.0, "fetched_at": 0.0}
 _OPENF1_TOKEN_LOCK = threading.RLock()
@@ -589,9 +792,9 @@ def _openf1_fetch_login_token() -> tuple[str, float]:
         except Exception:
             logging.warning("[OpenF1Auth] OPENF1_AUTH_HEADERS_JSON is not valid JSON.")
 
-    r = requests.post(auth_url, data=payload, headers=req_headers, timeout=20)
+    r = REQUESTS_SESSION.post(auth_url, data=payload, headers=req_headers, timeout=20)
     r.raise_for_status()
-    body = r.json() if r.content else {}
+    body = _json_loads(r.content) if r.content else {}
     token = str(_json_path_get(body, token_key) or "").strip()
     if not token:
         raise RuntimeError("auth response missing token")
@@ -685,9 +888,9 @@ def _openf1_get_json(
 
     url = f"{OPENF1_BASE}/{endpoint.lstrip('/')}"
     t0 = time.time()
-    r = requests.get(url, params=params or {}, timeout=timeout, headers=_openf1_auth_headers())
+    r = REQUESTS_SESSION.get(url, params=params or {}, timeout=timeout, headers=_openf1_auth_headers())
     if r.status_code in (401, 403):
-        r = requests.get(url, params=params or {}, timeout=timeout, headers=_openf1_auth_headers(force_refresh=True))
+        r = REQUESTS_SESSION.get(url, params=params or {}, timeout=timeout, headers=_openf1_auth_headers(force_refresh=True))
     latency_ms = int((time.time() - t0) * 1000)
     _openf1_trace_record(caller=str(caller or "unknown"), endpoint=str(endpoint or ""), status_code=int(r.status_code), latency_ms=latency_ms)
     if int(r.status_code) == 429:
@@ -696,7 +899,15 @@ def _openf1_get_json(
     elif int(r.status_code) == 503:
         _openf1_set_endpoint_cooldown(endpoint, 15)
     r.raise_for_status()
-    return r.json()
+    return _json_loads(r.content)
+
+async def _openf1_get_cached(endpoint: str, params: Dict[str, Any], caller: str) -> Any:
+    """_openf1_get on the shared session, memoized in OPENF1_JSON for standings polls."""
+    key = f"{endpoint}?{json.dumps(params, sort_keys=True, default=str)}"
+    hit = OPENF1_JSON.get(key, _standings_cache_ttl())
+    if hit is not None:
+        return hit[1]
+    return OPENF1_JSON.put(key, await _openf1_get(_http_session(), endpoint, params, caller=caller))
 
 def _parse_openf1_dt(dt_raw: Any) -> Optional[datetime]:
     if not dt_raw:
@@ -723,10 +934,9 @@ def _state_bucket(key: str) -> Dict[str, Any]:
     return bucket
 
 def _save_state_quiet() -> None:
-    try:
-        save_state(STATE)
-    except Exception as e:
-        logging.error(f"[State] save_state failed: {e}")
+    # Routed through the debounced flusher: bursts of live-race / alert
+    # updates coalesce into one off-loop write instead of one per change.
+    schedule_state_save()
 
 ALERT_RATE_LIMIT: Dict[str, float] = {}
 
@@ -1032,7 +1242,7 @@ async def fetch_current_season_schedule(force: bool = False) -> List[Dict[str, A
     year = datetime.now(timezone.utc).year
     races: List[Dict[str, Any]] = []
     try:
-        sessions = await asyncio.to_thread(_openf1_get_json, "sessions", {"year": year}, 20, "schedule_fetch")
+        sessions = await _openf1_get(_http_session(), "sessions", {"year": year}, caller="schedule_fetch")
         if isinstance(sessions, list) and sessions:
             races = _normalize_schedule_from_openf1(sessions, year=year)
             F1_SCHEDULE_CACHE["fail_until"] = 0.0
@@ -1534,12 +1744,11 @@ async def _openf1_candidate_race_session_keys() -> List[Any]:
     for year in years:
         for session_type in POINTS_SESSION_TYPES:
             try:
-                sessions = await asyncio.to_thread(
-                    _openf1_get_json,
+                sessions = await _openf1_get(
+                    _http_session(),
                     "sessions",
                     {"year": year, "session_type": session_type},
-                    20,
-                    "standings_candidate_sessions",
+                    caller="standings_candidate_sessions",
                 )
             except Exception:
                 continue
@@ -1669,14 +1878,14 @@ def _standings_from_cache(use_previous: bool = False) -> List[Dict[str, Any]]:
 async def _fetch_champ_driver_rows(session_key: Any) -> List[Dict[str, Any]]:
     """Fetch and process championship_drivers for a single session key. Returns [] if unavailable."""
     try:
-        rows = await asyncio.to_thread(_openf1_get_json, "championship_drivers", {"session_key": session_key}, 20, "standings_drivers")
+        rows = await _openf1_get_cached("championship_drivers", {"session_key": session_key}, caller="standings_drivers")
     except Exception:
         return []
     if not isinstance(rows, list) or not rows:
         return []
     meta_map: Dict[int, Dict[str, Any]] = {}
     try:
-        drivers = await asyncio.to_thread(_openf1_get_json, "drivers", {"session_key": session_key}, 20, "standings_driver_meta")
+        drivers = await _openf1_get_cached("drivers", {"session_key": session_key}, caller="standings_driver_meta")
         if isinstance(drivers, list):
             for d in drivers:
                 if not isinstance(d, dict):
@@ -1783,7 +1992,19 @@ async def _openf1_driver_standings_rows(limit: int = 0) -> List[Dict[str, Any]]:
     return out if not limit else out[:int(limit)]
 
 
+# The last computed pair (STANDINGS_PAIR) is reused for one refresh window so
+# the updater loop, the standings commands and a standingssetup repost share
+# one build. Cleared by configreload / standingsrefresh.
 async def _openf1_driver_standings_pair() -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    hit = STANDINGS_PAIR.get("pair", max(0, _refresh_seconds() - 5))
+    if hit is not None:
+        return hit[1]
+    pair = await _build_driver_standings_pair()
+    if pair[0]:
+        STANDINGS_PAIR.put("pair", pair)
+    return pair
+
+async def _build_driver_standings_pair() -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """Returns (current_standings, previous_standings).
 
     Primary path: current = local cache sorted by points; previous = the
@@ -1860,13 +2081,13 @@ async def fetch_driver_standings_text(limit: int = 0, _pair=None) -> str:
     if not current:
         return "No standings available from OpenF1."
     prev_pos: Dict[int, int] = {r["driver_number"]: r["position"] for r in previous}
-    lines = []
-    for r in current:
-        pos = int(r.get("position", 0))
-        num = int(r.get("driver_number", 0))
-        delta = _delta_str(pos, prev_pos.get(num))
-        lines.append(f"{pos:>2}. {r.get('name', 'Unknown')} - {r.get('points', 0)} pts  {delta}")
-    return "__**F1 Driver Standings**__\n```\n" + "\n".join(lines) + "\n```"
+    # Rows come from _standings_from_cache/_fetch_champ_driver_rows, which
+    # always fill these keys with ints, so index directly.
+    body = "\n".join(
+        f"{r['position']:>2}. {r['name']} - {r['points']} pts  {_delta_str(r['position'], prev_pos.get(r['driver_number']))}"
+        for r in current
+    )
+    return f"__**F1 Driver Standings**__\n```\n{body}\n```"
 
 
 async def fetch_constructor_standings_text(limit: int = 0, _pair=None) -> str:
@@ -1875,13 +2096,11 @@ async def fetch_constructor_standings_text(limit: int = 0, _pair=None) -> str:
         return "No standings available from OpenF1."
     current_rows = _build_constructor_rows(current_drivers)
     prev_pos: Dict[str, int] = {r["name"]: r["position"] for r in _build_constructor_rows(prev_drivers)}
-    lines = []
-    for r in current_rows:
-        pos = int(r.get("position", 0))
-        name = r.get("name", "Unknown")
-        delta = _delta_str(pos, prev_pos.get(name))
-        lines.append(f"{pos:>2}. {name} - {r.get('points', 0)} pts  {delta}")
-    return "__**F1 Constructor Standings**__\n```\n" + "\n".join(lines) + "\n```"
+    body = "\n".join(
+        f"{r['position']:>2}. {r['name']} - {r['points']} pts  {_delta_str(r['position'], prev_pos.get(r['name']))}"
+        for r in current_rows
+    )
+    return f"__**F1 Constructor Standings**__\n```\n{body}\n```"
 
 # Discord setup
 # ----------------------------
@@ -1889,36 +2108,46 @@ intents = discord.Intents.default()
 intents.message_content = True
 intents.reactions = True
 intents.guilds = True
+# Required: reaction handlers and role recovery resolve members from the
+# gateway cache (guild.get_member) and only fall back to fetch_member on a miss.
 intents.members = True
 
 def get_prefix(bot, message) -> str:
-    return (CFG.get("prefix") or "!").strip() or "!"
+    return COMMAND_PREFIX
+
+_BG_WORKERS = 4
+
+class OF1Bot(commands.Bot):
+    async def setup_hook(self) -> None:
+        loop = asyncio.get_running_loop()
+        # asyncio.to_thread only carries occasional file writes and sync
+        # OpenF1 calls here; a small named pool beats the default
+        # min(32, cpu+4) workers. asyncio.run shuts it down on exit.
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=_BG_WORKERS, thread_name_prefix="of1-bg"))
 
-bot = commands.Bot(command_prefix=get_prefix, intents=intents, help_command=None)
+    async def close(self) -> None:
+        await write_state_now()
+        await _close_http_session()
+        await super().close()
+
+bot = OF1Bot(command_prefix=get_prefix, intents=intents, help_command=None)
 APP_COMMANDS_SYNCED = False
 
 # ----------------------------
 # Helpers: role mapping
 # ----------------------------
-def cfg_reaction_roles() -> Dict[str, str]:
-    return dict(ROLE_MAP_REACTION)
+def cfg_reaction_roles() -> Mapping[str, str]:
+    return _ROLE_MAP_VIEWS["reaction"]
 
-def cfg_color_roles() -> Dict[str, str]:
-    return dict(ROLE_MAP_COLOR)
+def cfg_color_roles() -> Mapping[str, str]:
+    return _ROLE_MAP_VIEWS["color"]
 
-def cfg_driver_emoji_names() -> Dict[str, str]:
+def cfg_driver_emoji_names() -> Mapping[str, str]:
     """
     Mapping of custom emoji NAME -> role name.
     Example: {"Piastri":"Piastri"}
     """
-    return dict(CFG.get("driver_emoji_names") or {})
-
-def color_role_names() -> set[str]:
-    return set(COLOR_ROLE_NAMES_CACHE)
-
-def state_driver_map() -> Dict[str, str]:
-    # emoji string (e.g. "<:Piastri:123>") -> role name
-    return dict(ROLE_MAP_DRIVER)
+    return _ROLE_MAP_VIEWS["driver_emoji_names"]
 
 def _ensure_reaction_panels_state() -> Dict[str, Any]:
     global STATE
@@ -1934,7 +2163,8 @@ def write_reaction_panel_state(panel: str, channel_id: int, message_id: int) ->
         "channel_id": str(channel_id),
         "message_id": str(message_id),
     }
-    save_state(STATE)
+    schedule_state_save()
+    _rebuild_role_caches()
 
 def _get_reaction_panel(panel: str) -> Optional[Tuple[int, int]]:
     panels = STATE.get("reaction_panels") or {}
@@ -1946,19 +2176,8 @@ def _get_reaction_panel(panel: str) -> Optional[Tuple[int, int]]:
     except Exception:
         return None
 
-def allowed_reaction_panel_message_ids() -> set[int]:
-    ids: set[int] = set()
-    for panel in ("notifications", "colors"):
-        rec = _get_reaction_panel(panel)
-        if rec:
-            ids.add(rec[1])
-    try:
-        driver_msg_id = int(((STATE.get("driver_roles") or {}).get("message_id")) or 0)
-        if driver_msg_id:
-            ids.add(driver_msg_id)
-    except Exception:
-        pass
-    return ids
+def allowed_reaction_panel_message_ids() -> frozenset[int]:
+    return TRACKED_PANEL_MESSAGE_IDS
 
 def reaction_panel_targets_for_guild(guild: discord.Guild) -> List[Tuple[str, int, int]]:
     targets: List[Tuple[str, int, int]] = []
@@ -1986,16 +2205,77 @@ def write_state_driver_map(channel_id: int, message_id: int, emoji_to_role: Dict
     STATE["driver_roles"]["channel_id"] = str(channel_id)
     STATE["driver_roles"]["message_id"] = str(message_id)
     STATE["driver_roles"]["emoji_to_role"] = dict(emoji_to_role)
-    save_state(STATE)
+    schedule_state_save()
+    _rebuild_role_caches()
+
+def clear_reaction_panel_state(panel: str) -> None:
+    """Forget a panel whose message was deleted so later sweeps stop fetching it."""
+    if panel == "drivers":
+        drv = STATE.get("driver_roles")
+        if not isinstance(drv, dict):
+            return
+        drv.pop("channel_id", None)
+        drv.pop("message_id", None)
+    else:
+        panels = STATE.get("reaction_panels")
+        if not isinstance(panels, dict) or panels.pop(panel, None) is None:
+            return
+    schedule_state_save()
     _rebuild_role_caches()
 
 def resolve_role_name_from_emoji(emoji_str: str) -> Optional[str]:
-    # order matters: notifications + colors + drivers(state)
-    return (
-        ROLE_MAP_REACTION.get(emoji_str)
-        or ROLE_MAP_COLOR.get(emoji_str)
-        or ROLE_MAP_DRIVER.get(emoji_str)
-    )
+    # order matters: notifications + colors + drivers(state); see _rebuild_role_caches
+    return ROLE_MAP_EMOJI.get(emoji_str)
+
+# guild id -> {role name: Role}; kept fresh by the on_guild_role_* listeners so
+# reaction handlers don't linearly scan guild.roles for every lookup.
+_GUILD_ROLE_INDEX: Dict[int, Dict[str, discord.Role]] = {}
+
+def _rebuild_guild_role_index(guild: discord.Guild) -> Dict[str, discord.Role]:
+    # reversed() so the lowest-positioned duplicate wins, like discord.utils.get
+    index = {r.name: r for r in reversed(guild.roles)}
+    _GUILD_ROLE_INDEX[guild.id] = index
+    return index
+
+def guild_role_by_name(guild: discord.Guild, name: str) -> Optional[discord.Role]:
+    index = _GUILD_ROLE_INDEX.get(guild.id)
+    if index is None:
+        index = _rebuild_guild_role_index(guild)
+    return index.get(name)
+
+# (guild id, user id) -> lock serializing one member's role edits (reaction
+# handlers and recovery), so each starts only after the previous one's REST
+# calls have completed. Idle locks beyond the cap are evicted oldest-first.
+_MEMBER_LOCKS: "OrderedDict[Tuple[int, int], asyncio.Lock]" = OrderedDict()
+_MEMBER_LOCKS_MAX = 1024
+
+def _member_lock(guild_id: int, user_id: int) -> asyncio.Lock:
+    key = (guild_id, user_id)
+    lock = _MEMBER_LOCKS.get(key)
+    if lock is not None:
+        _MEMBER_LOCKS.move_to_end(key)
+        return lock
+    lock = _MEMBER_LOCKS[key] = asyncio.Lock()
+    while len(_MEMBER_LOCKS) > _MEMBER_LOCKS_MAX:
+        oldest = next(iter(_MEMBER_LOCKS))
+        if _MEMBER_LOCKS[oldest].locked():
+            break  # still in use; try again on the next insert
+        del _MEMBER_LOCKS[oldest]
+    return lock
+
+async def _assign_role_exclusive(member: discord.Member, role: discord.Role, role_name: str, reason: str) -> None:
+    """Give `role` to member; for color roles, drop the member's other colors.
+
+    Uses the per-role add/remove routes rather than a full member.edit(roles=),
+    so a stale member.roles can at worst leave an extra color behind — it never
+    reverts a role granted elsewhere. Pass a freshly fetched member when the
+    color set matters.
+    """
+    if role_name in COLOR_ROLE_NAMES_CACHE:
+        stale = [r for r in member.roles if r.name in COLOR_ROLE_NAMES_CACHE and r.id != role.id]
+        if stale:
+            await member.remove_roles(*stale, reason=reason)
+    await member.add_roles(role, reason=reason)
 
 # ============================================================
 # XP SYSTEM (Mee6-style basic)
@@ -2278,7 +2558,7 @@ async def xpgate(ctx, channel: discord.TextChannel, level: int):
         return await ctx.send("❌ This must be used in a server.")
     level = max(0, min(500, int(level)))
 
-    reload_config_state()
+    await areload_config_state()
     mapping = cfg_xp_min_level_channels()
     mapping[str(channel.id)] = level
     CFG["xp_min_level_channels"] = mapping
@@ -2293,7 +2573,7 @@ async def xpgateclear(ctx, channel: discord.TextChannel):
     if ctx.guild is None:
         return await ctx.send("❌ This must be used in a server.")
 
-    reload_config_state()
+    await areload_config_state()
     mapping = cfg_xp_min_level_channels()
     if str(channel.id) in mapping:
         del mapping[str(channel.id)]
@@ -2308,10 +2588,24 @@ async def xpgateclear(ctx, channel: discord.TextChannel):
 @bot.hybrid_command(name="configreload", aliases=["config_reload"])
 @commands.has_permissions(administrator=True)
 async def configreload(ctx):
-    """Reload config.json + state.json without restarting the bot."""
-    reload_config_state()
+    """Reload config.json, state.json and .env without restarting the bot."""
+    await areload_config_state()
     load_f1_static_data()
-    await ctx.send("✅ Reloaded config.json, state.json, and F1 data files.")
+    # Hand edits to .env only reach os.environ through an explicit reload;
+    # then re-parse every cached env setting.
+    await asyncio.to_thread(load_dotenv, ENV_PATH, override=True)
+    _refresh_race_test_env()
+    _refresh_standings_env_cache()
+    STANDINGS_PAIR.clear()
+    await ctx.send("✅ Reloaded config.json, state.json, .env, and F1 data files.")
+
+@bot.hybrid_command(name="standingsrefresh", aliases=["standings_refresh"])
+@commands.has_permissions(administrator=True)
+async def standingsrefresh(ctx):
+    """Drop cached API responses and re-post standings immediately."""
+    clear_standings_caches()
+    await update_standings_once()
+    await ctx.send("✅ Standings cache cleared and messages refreshed.")
 
 # ----------------------------
 # Commands: reaction role setup
@@ -2324,11 +2618,14 @@ async def setupnotifications(ctx):
         await ctx.send("❌ No reaction_roles configured in config.json.")
         return
 
-    description = "📰 **Get notified!**\nReact to opt in to pingable news roles."
-    for emoji, role in roles.items():
-        description += f"\n{emoji} → `{role}`"
+    description = "\n".join([
+        "📰 **Get notified!**\nReact to opt in to pingable news roles.",
+        *(f"{emoji} → `{role}`" for emoji, role in roles.items()),
+    ])
 
     msg = await ctx.send(description)
+    # Sequential on purpose: reaction order on the panel follows the config,
+    # and Discord's per-channel reaction bucket serializes these calls anyway.
     for emoji in roles.keys():
         await msg.add_reaction(emoji)
     write_reaction_panel_state("notifications", ctx.channel.id, msg.id)
@@ -2344,9 +2641,10 @@ async def setupcolors(ctx):
         await ctx.send("❌ No color_roles configured in config.json.")
         return
 
-    description = "🎨 **Choose your name color!**\nReact with an emoji to get a matching role. Only one color can be active at a time."
-    for emoji, role in roles.items():
-        description += f"\n{emoji} → `{role}`"
+    description = "\n".join([
+        "🎨 **Choose your name color!**\nReact with an emoji to get a matching role. Only one color can be active at a time.",
+        *(f"{emoji} → `{role}`" for emoji, role in roles.items()),
+    ])
 
     msg = await ctx.send(description)
     for emoji in roles.keys():
@@ -2373,7 +2671,7 @@ async def setupdrivers(ctx):
         await ctx.send("❌ No driver_emoji_names configured in config.json.")
         return
 
-    description = "\U0001F3CE\uFE0F **Choose your favorite F1 driver!**\nReact to get a fan role:"
+    lines = ["\U0001F3CE\uFE0F **Choose your favorite F1 driver!**\nReact to get a fan role:"]
     emoji_to_role: Dict[str, str] = {}
     missing = []
 
@@ -2382,9 +2680,10 @@ async def setupdrivers(ctx):
         if emoji_obj:
             emoji_str = str(emoji_obj)  # "<:Name:123>"
             emoji_to_role[emoji_str] = role_name
-            description += f"\n{emoji_obj} → `{role_name}`"
+            lines.append(f"{emoji_obj} → `{role_name}`")
         else:
             missing.append(emoji_name)
+    description = "\n".join(lines)
 
     if missing:
         await ctx.send("\u26A0\uFE0F Missing custom emojis: " + ", ".join(missing))
@@ -2404,7 +2703,7 @@ async def setupdrivers(ctx):
 @bot.command(name="instacheck", aliases=["insta_check"])
 @commands.has_permissions(administrator=True)
 async def instacheck(ctx, username: str = "of1.official"):
-    post_url = await asyncio.to_thread(fetch_latest_instagram_post, username)
+    post_url = await fetch_latest_instagram_post(username)
     if post_url:
         await ctx.send(f"📸 Latest Instagram post from `{username}`:\n{post_url}")
     else:
@@ -2433,7 +2732,7 @@ async def editmsg(ctx, channel_id: int, message_id: int, *, new_text: str):
 @bot.command(name="botinfo")
 @commands.has_permissions(administrator=True)
 async def botinfo(ctx):
-    uptime = datetime.now() - bot.launch_time
+    uptime = timedelta(seconds=int(time.monotonic() - bot.launch_monotonic))
     await ctx.send(f"🛠 **Bot Uptime:** {uptime}")
 
 @bot.command(name="serverlist")
@@ -2442,15 +2741,48 @@ async def serverlist(ctx):
     guild_names = ", ".join(g.name for g in bot.guilds)
     await ctx.send(f"🤖 Connected to: {guild_names}")
 
+def _tail_log_lines(path: str, n: int) -> str:
+    """Return the last n lines of path, reading backwards in blocks from EOF."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        buf = b""
+        while pos > 0 and buf.count(b"\n") <= n:
+            step = min(4096, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+    return "\n".join(line.decode("utf-8", "replace") for line in buf.splitlines()[-n:])
+
+def _chunk_lines(text: str, limit: int = 1900) -> List[str]:
+    """Pack lines into chunks under limit chars; overlong lines are hard-split."""
+    chunks: List[str] = []
+    cur: List[str] = []
+    size = 0
+    for line in text.splitlines():
+        if cur and size + len(line) + 1 > limit:
+            chunks.append("\n".join(cur))
+            cur, size = [], 0
+        while len(line) > limit:
+            chunks.append(line[:limit])
+            line = line[limit:]
+        cur.append(line)
+        size += len(line) + 1
+    if cur:
+        chunks.append("\n".join(cur))
+    return chunks
+
+_LOGRECENT_MAX_MESSAGES = 5
+
 @bot.command(name="logrecent")
 @commands.has_permissions(administrator=True)
 async def logrecent(ctx, lines: int = 10):
     try:
         lines = max(1, min(200, int(lines)))
-        with open(LOG_PATH, "r", encoding="utf-8") as f:
-            all_lines = f.readlines()
-        text = "".join(all_lines[-lines:])
-        await ctx.send(f"```\n{text[:1900]}\n```")
+        text = await asyncio.to_thread(_tail_log_lines, LOG_PATH, lines)
+        # Keep the newest chunks if the tail is longer than we're willing to post.
+        for chunk in _chunk_lines(text)[-_LOGRECENT_MAX_MESSAGES:] or [""]:
+            await ctx.send(f"```\n{chunk}\n```")
     except Exception as e:
         await ctx.send(f"❌ Could not read log: {e}")
 
@@ -2480,7 +2812,7 @@ _HELP_CATEGORIES: Dict[str, Dict] = {
         "label": "⚙️ Admin",
         "commands": [
             "f1reminders", "f1reminderleads", "setupnotifications", "setupcolors",
-            "setupdrivers", "configreload", "standingssetup", "editmsg",
+            "setupdrivers", "rolesresync", "configreload", "standingssetup", "standingsrefresh", "editmsg",
             "botinfo", "serverlist", "logrecent", "xpset", "xpreset", "xpaudit", "xpgate",
         ],
     },
@@ -2562,10 +2894,12 @@ def _command_examples(prefix: str) -> Dict[str, str]:
         "setupnotifications": f"{p}setupnotifications",
         "setupcolors": f"{p}setupcolors",
         "setupdrivers": f"{p}setupdrivers",
+        "rolesresync": f"{p}rolesresync",
         "instacheck": f"{p}instacheck of1.official",
         "editmsg": f"{p}editmsg <channel_id> <message_id> New text",
         "logrecent": f"{p}logrecent 25",
         "standingssetup": f"{p}standingssetup both 5",
+        "standingsrefresh": f"{p}standingsrefresh",
         "racelivestart": f"{p}racelivestart",
         "racelivestop": f"{p}racelivestop",
         "racelivetail": f"{p}racelivetail 20",
@@ -2575,6 +2909,7 @@ def _command_examples(prefix: str) -> Dict[str, str]:
         "racelivekill": f"{p}racelivekill",
         "racetestlist": f"{p}racetestlist",
         "racetestinfo": f"{p}racetestinfo practice_short",
+        "racetestreload": f"{p}racetestreload",
         "raceteststart": f"{p}raceteststart race_chaos 5",
         "raceteststop": f"{p}raceteststop",
         "openf1check": f"{p}openf1check 2026",
@@ -2615,12 +2950,14 @@ def _command_descriptions() -> Dict[str, str]:
         "setupnotifications": "Post the notifications reaction-role panel (admin).",
         "setupcolors": "Post the color roles reaction-role panel (admin).",
         "setupdrivers": "Post the driver roles reaction-role panel (admin).",
+        "rolesresync": "Re-read reaction panels and restore missing roles (admin).",
         "instacheck": "Fetch the latest Instagram post URL for a username.",
         "editmsg": "Edit a bot-authored message by channel and message ID (admin).",
         "botinfo": "Show bot uptime and basic status (admin).",
         "serverlist": "List servers the bot is connected to (admin).",
         "logrecent": "Show recent lines from the bot log file (admin).",
         "standingssetup": "Create or refresh standings messages (admin).",
+        "standingsrefresh": "Clear cached standings data and update the messages now (admin).",
         "racelivestart": "Start race live tracking/supervision (admin).",
         "racelivestop": "Stop race live tracking loop (admin).",
         "racelivetail": "Show recent race-live event output (admin).",
@@ -2630,6 +2967,7 @@ def _command_descriptions() -> Dict[str, str]:
         "racelivekill": "Force-stop race-live worker tasks (admin).",
         "racetestlist": "List available race simulation scenarios.",
         "racetestinfo": "Show details for a race simulation scenario.",
+        "racetestreload": "Re-read race simulation scenarios from disk (admin).",
         "raceteststart": "Start a race simulation scenario (admin).",
         "raceteststop": "Stop the active race simulation scenario (admin).",
         "openf1check": "Run OpenF1 API/auth/championship diagnostics (admin).",
@@ -2646,22 +2984,40 @@ def _fallback_command_example(cmd: commands.Command, prefix: str) -> str:
     sig = (cmd.signature or "").strip()
     return f"{prefix}{cmd.name}" + (f" {sig}" if sig else "")
 
+# The only command checks are has_permissions(...), so what a caller can run is
+# fully determined by guild + their channel permissions. Cache per key for a
+# minute so repeated !commands calls skip the can_run fan-out.
+_COMMAND_LIST_CACHE: Dict[Tuple[int, int, str], Tuple[float, List[str]]] = {}
+_COMMAND_LIST_TTL_SECONDS = 60.0
+
+async def _visible_command_entries(ctx, prefix: str) -> List[str]:
+    perms = ctx.channel.permissions_for(ctx.author).value if ctx.guild is not None else 0
+    key = (ctx.guild.id if ctx.guild is not None else 0, perms, prefix)
+    hit = _COMMAND_LIST_CACHE.get(key)
+    now = time.monotonic()
+    if hit is not None and now - hit[0] < _COMMAND_LIST_TTL_SECONDS:
+        return hit[1]
+
+    cmds = sorted(bot.commands, key=lambda c: c.name.lower())
+    results = await asyncio.gather(*(cmd.can_run(ctx) for cmd in cmds), return_exceptions=True)
+    examples = _command_examples(prefix)
+    visible: List[str] = []
+    for cmd, ok in zip(cmds, results):
+        if ok is not True:
+            continue
+        ex = examples.get(cmd.name) or _fallback_command_example(cmd, prefix)
+        desc = _command_description_for(cmd)
+        visible.append(f"`{prefix}{cmd.name}` - {desc}\nExample: `{ex}`")
+    _COMMAND_LIST_CACHE[key] = (now, visible)
+    return visible
+
 @bot.command(name="commands", aliases=["commandlist"])
 async def commands_dm_list(ctx):
     """
     DM the caller a dynamic list of commands they can access, with examples.
     """
     prefix = getattr(ctx, "clean_prefix", None) or "!"
-    examples = _command_examples(prefix)
-    visible: List[str] = []
-    for cmd in sorted(bot.commands, key=lambda c: c.name.lower()):
-        try:
-            if await cmd.can_run(ctx):
-                ex = examples.get(cmd.name) or _fallback_command_example(cmd, prefix)
-                desc = _command_description_for(cmd)
-                visible.append(f"`{prefix}{cmd.name}` - {desc}\nExample: `{ex}`")
-        except Exception:
-            continue
+    visible = await _visible_command_entries(ctx, prefix)
 
     if not visible:
         return await ctx.send("❌ You don't have access to any commands.")
@@ -2900,30 +3256,61 @@ async def quizscore(ctx):
 # Standings updater
 # ----------------------------
 STANDINGS_TASK: Optional[asyncio.Task] = None
+# message id -> content last written, so unchanged standings skip the edit
+# (and the fetch_message before it) instead of spending Discord rate limit.
+_STANDINGS_LAST_TEXT: Dict[int, str] = {}
 
-def _refresh_seconds() -> int:
+def _env_int(name: str, default: int = 0) -> int:
     try:
-        minutes = int(os.getenv("STANDINGS_REFRESH_MINUTES", "5"))
+        return int(os.getenv(name, "") or default)
     except ValueError:
-        minutes = 5
-    minutes = max(1, min(120, minutes))
-    return minutes * 60
+        return default
+
+# Parsed standings settings from .env, so the loop never re-parses the
+# environment per tick. Refreshed by standingssetup (after set_env_value) and
+# by configreload (after re-reading .env).
+_STANDINGS_CFG: Dict[str, int] = {}
+
+def _refresh_standings_env_cache() -> None:
+    _STANDINGS_CFG.update(
+        channel_id=_env_int("STANDINGS_CHANNEL_ID"),
+        driver_msg=_env_int("DRIVER_STANDINGS_MESSAGE_ID"),
+        constr_msg=_env_int("CONSTRUCTOR_STANDINGS_MESSAGE_ID"),
+        refresh_sec=max(1, min(120, _env_int("STANDINGS_REFRESH_MINUTES", 5))) * 60,
+    )
+
+_refresh_standings_env_cache()
+
+def _refresh_seconds() -> int:
+    return _STANDINGS_CFG["refresh_sec"]
+
+async def _edit_standings_message(channel, message_id: int, text: Any, label: str) -> None:
+    try:
+        if isinstance(text, Exception):
+            raise text
+        content = text or "No standings available."
+        if _STANDINGS_LAST_TEXT.get(message_id) != content:
+            msg = await channel.fetch_message(message_id)
+            await msg.edit(content=content)
+            _STANDINGS_LAST_TEXT[message_id] = content
+    except Exception as e:
+        logging.error(f"[Standings] {label} update failed: {e}")
 
 async def update_standings_once():
-    channel_id = os.getenv("STANDINGS_CHANNEL_ID")
+    channel_id = _STANDINGS_CFG["channel_id"]
     if not channel_id:
         return
 
-    channel = bot.get_channel(int(channel_id))
+    channel = bot.get_channel(channel_id)
     if channel is None:
         try:
-            channel = await bot.fetch_channel(int(channel_id))
+            channel = await bot.fetch_channel(channel_id)
         except Exception as e:
             logging.error(f"[Standings] Could not fetch channel {channel_id}: {e}")
             return
 
-    driver_msg_id = os.getenv("DRIVER_STANDINGS_MESSAGE_ID")
-    constructor_msg_id = os.getenv("CONSTRUCTOR_STANDINGS_MESSAGE_ID")
+    driver_msg_id = _STANDINGS_CFG["driver_msg"]
+    constructor_msg_id = _STANDINGS_CFG["constr_msg"]
 
     driver_text = constructor_text = None
     if driver_msg_id or constructor_msg_id:
@@ -2943,23 +3330,15 @@ async def update_standings_once():
             except Exception as e:
                 constructor_text = e
 
+    # The two messages are independent, so their fetch_message + edit round
+    # trips run concurrently; each logs its own failure.
+    edits = []
     if driver_msg_id:
-        try:
-            if isinstance(driver_text, Exception):
-                raise driver_text
-            msg = await channel.fetch_message(int(driver_msg_id))
-            await msg.edit(content=driver_text or "No standings available.")
-        except Exception as e:
-            logging.error(f"[Standings] Driver update failed: {e}")
-
+        edits.append(_edit_standings_message(channel, driver_msg_id, driver_text, "Driver"))
     if constructor_msg_id:
-        try:
-            if isinstance(constructor_text, Exception):
-                raise constructor_text
-            msg = await channel.fetch_message(int(constructor_msg_id))
-            await msg.edit(content=constructor_text or "No standings available.")
-        except Exception as e:
-            logging.error(f"[Standings] Constructor update failed: {e}")
+        edits.append(_edit_standings_message(channel, constructor_msg_id, constructor_text, "Constructor"))
+    if edits:
+        await asyncio.gather(*edits)
 
 async def standings_loop():
     await bot.wait_until_ready()
@@ -3015,10 +3394,10 @@ def _runtime_status_snapshot() -> Dict[str, Any]:
             "poll_seconds": _race_live_poll_seconds(),
         },
         "standings": {
-            "channel_id": int(os.getenv("STANDINGS_CHANNEL_ID", "0") or 0),
-            "driver_message_id": int(os.getenv("DRIVER_STANDINGS_MESSAGE_ID", "0") or 0),
-            "constructor_message_id": int(os.getenv("CONSTRUCTOR_STANDINGS_MESSAGE_ID", "0") or 0),
-            "refresh_minutes": int(os.getenv("STANDINGS_REFRESH_MINUTES", "5") or 5),
+            "channel_id": _STANDINGS_CFG["channel_id"],
+            "driver_message_id": _STANDINGS_CFG["driver_msg"],
+            "constructor_message_id": _STANDINGS_CFG["constr_msg"],
+            "refresh_minutes": _STANDINGS_CFG["refresh_sec"] // 60,
         },
         "openf1_window": {
             "pre_buffer_hours": int(os.getenv("OPENF1_PRE_WEEKEND_BUFFER_HOURS", os.getenv("RACE_WINDOW_PADDING_HOURS", "24")) or 24),
@@ -3099,14 +3478,15 @@ async def standingssetup(ctx, which: str = "both", refresh_minutes: int = 5):
         msg = await ctx.send("\U0001F3C1 **F1 Constructor Standings (Current Season)**\nLoading...")
         set_env_value("CONSTRUCTOR_STANDINGS_MESSAGE_ID", str(msg.id))
         created.append(f"✅ Constructors message: `{msg.id}`")
+    _refresh_standings_env_cache()
 
-    reload_config_state()
+    await areload_config_state()
     if "standings" not in STATE:
         STATE["standings"] = {}
     STATE["standings"]["channel_id"] = str(ctx.channel.id)
     STATE["standings"]["driver_message_id"] = os.getenv("DRIVER_STANDINGS_MESSAGE_ID")
     STATE["standings"]["constructor_message_id"] = os.getenv("CONSTRUCTOR_STANDINGS_MESSAGE_ID")
-    save_state(STATE)
+    schedule_state_save()
 
     await update_standings_once()
     ensure_standings_task_running()
@@ -3202,7 +3582,7 @@ async def f1_reminder_loop():
     while not bot.is_closed():
         _loop_tick("f1_reminders")
         try:
-            reload_config_state()
+            await areload_config_state_if_changed()
             cfg = _f1_reminder_cfg()
             if not cfg["enabled"] or not cfg["channel_id"]:
                 await asyncio.sleep(60)
@@ -3278,13 +3658,13 @@ async def f1reminders(ctx, mode: str = "status", channel: discord.TextChannel =
             channel = ctx.channel if isinstance(ctx.channel, discord.TextChannel) else None
         if channel is None:
             return await ctx.send("❌ Provide a text channel, e.g. `!f1reminders on #channel`.")
-        reload_config_state()
+        await areload_config_state()
         CFG["f1_reminders_enabled"] = True
         CFG["f1_reminders_channel_id"] = int(channel.id)
         save_config(CFG)
         return await ctx.send(f"✅ F1 reminders enabled in {channel.mention}.")
     if mode in {"off", "disable"}:
-        reload_config_state()
+        await areload_config_state()
         CFG["f1_reminders_enabled"] = False
         save_config(CFG)
         return await ctx.send("✅ F1 reminders disabled.")
@@ -3314,7 +3694,7 @@ async def f1reminderleads(ctx, *, minutes: str):
     if not parsed:
         return await ctx.send("❌ No valid minute values found. Example: `1440 60 15`")
     leads = sorted({max(1, min(10080, int(m))) for m in parsed}, reverse=True)
-    reload_config_state()
+    await areload_config_state()
     CFG["f1_reminder_leads_minutes"] = leads
     save_config(CFG)
     await ctx.send(f"✅ F1 reminder leads set to: `{', '.join(str(x) for x in leads)}` minutes.")
@@ -3508,10 +3888,11 @@ async def h2h(ctx, *, query: str):
                 Uses date_start + buffer to determine completion — date_end is unreliable.
                 Deny-lists known non-F1 series without requiring an explicit F1 label."""
                 try:
-                    raw = await asyncio.to_thread(
-                        _openf1_get_json, "sessions",
+                    raw = await _openf1_get(
+                        _http_session(), "sessions",
                         {"year": now.year, "session_type": session_type},
-                        30, f"h2h_sess_{session_type.lower().replace(' ', '_')}",
+                        caller=f"h2h_sess_{session_type.lower().replace(' ', '_')}",
+                        timeout=30,
                     )
                 except Exception:
                     return []
@@ -3549,10 +3930,10 @@ async def h2h(ctx, *, query: str):
                 Called sequentially — the position endpoint silently rate-limits
                 concurrent requests by returning empty lists."""
                 try:
-                    data = await asyncio.to_thread(
-                        _openf1_get_json, "position",
+                    data = await _openf1_get(
+                        _http_session(), "position",
                         {"session_key": session_key},
-                        20, "h2h_pos",
+                        caller="h2h_pos",
                     )
                     if not isinstance(data, list):
                         return {}
@@ -4242,8 +4623,14 @@ async def on_ready():
     logging.info(f"Bot is online as {bot.user}")
     if not hasattr(bot, "launch_time"):
         bot.launch_time = datetime.now()
-
-    reload_config_state()
+        # Uptime is measured on the monotonic clock so NTP steps can't skew it;
+        # launch_time stays for the wall-clock "started at" in runtime status.
+        bot.launch_monotonic = time.monotonic()
+
+    await areload_config_state()
+    _http_session()
+    for g in bot.guilds:
+        _rebuild_guild_role_index(g)
     try:
         init_runtime_db()
         migrated = migrate_alerts_from_state_json()
@@ -4294,157 +4681,326 @@ async def on_ready():
         except Exception as e:
             logging.error(f"[Slash] Command tree sync failed: {e}")
 
+# (guild id, panel message id) -> emoji -> reacting user ids. Seeded over REST
+# the first time the recovery sweep meets a panel, then kept current from the
+# raw reaction events, so later sweeps reconcile roles without paginating
+# reaction.users(). Memory only: a restart just reseeds on the next sweep.
+_REACTION_INDEX: Dict[Tuple[int, int], Dict[str, Set[int]]] = {}
+
+def _reaction_index_note(payload: discord.RawReactionActionEvent, added: bool) -> None:
+    emojis = _REACTION_INDEX.get((payload.guild_id or 0, payload.message_id))
+    if emojis is None:
+        return  # not seeded yet; the seeding sweep will read it fresh
+    users = emojis.setdefault(str(payload.emoji), set())
+    if added:
+        users.add(payload.user_id)
+    else:
+        users.discard(payload.user_id)
+
 @bot.event
 async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
     if payload.user_id == bot.user.id:
         return
+    # Cheapest rejections first: most reactions use emojis no panel maps.
+    role_name = resolve_role_name_from_emoji(str(payload.emoji))
+    if not role_name:
+        return
     if payload.message_id not in allowed_reaction_panel_message_ids():
         return
+    if payload.member is None or not payload.member.bot:
+        _reaction_index_note(payload, added=True)
     guild = bot.get_guild(payload.guild_id)
     if not guild:
         return
 
-    emoji_str = str(payload.emoji)
-    role_name = resolve_role_name_from_emoji(emoji_str)
-    if not role_name:
-        return
-
-    role = discord.utils.get(guild.roles, name=role_name)
+    role = guild_role_by_name(guild, role_name)
     if role is None:
         logging.warning(f"[Roles] Role '{role_name}' not found in guild '{guild.name}'")
         return
 
-    try:
-        member = await guild.fetch_member(payload.user_id)
-    except Exception as e:
-        logging.warning(f"[Roles] Could not fetch member {payload.user_id}: {e}")
-        return
-
-    try:
-        if role_name in color_role_names():
-            roles_to_remove = [
-                discord.utils.get(guild.roles, name=rname)
-                for rname in color_role_names()
-                if rname != role_name
-            ]
-            remove_list = [r for r in roles_to_remove if r and r in member.roles]
-            if remove_list:
-                await member.remove_roles(*remove_list)
+    async with _member_lock(guild.id, payload.user_id):
+        # Neither payload.member nor the gateway cache sees role edits an
+        # earlier handler made under this lock until GUILD_MEMBER_UPDATE
+        # arrives. A color swap needs the member's real current colors, so it
+        # reads them fresh over REST; a plain grant is a single per-role add
+        # that doesn't depend on member.roles at all.
+        if role_name in COLOR_ROLE_NAMES_CACHE:
+            member = None
+        else:
+            member = payload.member or guild.get_member(payload.user_id)
+        if member is None:
+            try:
+                member = await guild.fetch_member(payload.user_id)
+            except Exception as e:
+                logging.warning(f"[Roles] Could not fetch member {payload.user_id}: {e}")
+                return
 
-        await member.add_roles(role)
-        logging.info(f"[Roles] Assigned '{role_name}' to {member.name}")
-    except Exception as e:
-        logging.warning(f"[Roles] Failed assigning '{role_name}' to {member}: {e}")
+        try:
+            await _assign_role_exclusive(member, role, role_name, reason="reaction role")
+            logging.info(f"[Roles] Assigned '{role_name}' to {member.name}")
+        except Exception as e:
+            logging.warning(f"[Roles] Failed assigning '{role_name}' to {member}: {e}")
 
 @bot.event
 async def on_raw_reaction_remove(payload: discord.RawReactionActionEvent):
+    role_name = resolve_role_name_from_emoji(str(payload.emoji))
+    if not role_name:
+        return
     if payload.message_id not in allowed_reaction_panel_message_ids():
         return
+    _reaction_index_note(payload, added=False)
     guild = bot.get_guild(payload.guild_id)
     if not guild:
         return
 
-    emoji_str = str(payload.emoji)
-    role_name = resolve_role_name_from_emoji(emoji_str)
-    if not role_name:
-        return
-
-    role = discord.utils.get(guild.roles, name=role_name)
+    role = guild_role_by_name(guild, role_name)
     if role is None:
         return
 
+    async with _member_lock(guild.id, payload.user_id):
+        member = guild.get_member(payload.user_id)
+        if member is None:
+            try:
+                member = await guild.fetch_member(payload.user_id)
+            except Exception:
+                return
+
+        try:
+            await member.remove_roles(role)
+            logging.info(f"[Roles] Removed '{role_name}' from {member.name}")
+        except Exception as e:
+            logging.warning(f"[Roles] Failed removing '{role_name}' from {member}: {e}")
+
+@bot.event
+async def on_raw_reaction_clear(payload: discord.RawReactionClearEvent):
+    # Clearing reactions doesn't fire per-user removes; forget the panel so the
+    # next sweep reseeds it rather than re-granting from stale reactors.
+    _REACTION_INDEX.pop((payload.guild_id or 0, payload.message_id), None)
+
+@bot.event
+async def on_raw_reaction_clear_emoji(payload: discord.RawReactionClearEmojiEvent):
+    emojis = _REACTION_INDEX.get((payload.guild_id or 0, payload.message_id))
+    if emojis is not None:
+        emojis.pop(str(payload.emoji), None)
+
+@bot.event
+async def on_guild_role_create(role: discord.Role):
+    _rebuild_guild_role_index(role.guild)
+
+@bot.event
+async def on_guild_role_update(before: discord.Role, after: discord.Role):
+    _rebuild_guild_role_index(after.guild)
+
+@bot.event
+async def on_guild_role_delete(role: discord.Role):
+    _rebuild_guild_role_index(role.guild)
+
+@bot.event
+async def on_guild_remove(guild: discord.Guild):
+    _GUILD_ROLE_INDEX.pop(guild.id, None)
+    _FORUM_CHANNEL_CACHE.pop(guild.id, None)
+    for key in [k for k in _REACTION_INDEX if k[0] == guild.id]:
+        del _REACTION_INDEX[key]
+
+def _recovery_concurrency() -> int:
     try:
-        member = await guild.fetch_member(payload.user_id)
+        return max(1, min(32, int(CFG.get("recovery_concurrency", 8))))
     except Exception:
-        return
+        return 8
+
+async def _apply_recovered_roles(member: discord.Member, grants: List[Tuple[discord.Role, str]], sem: asyncio.Semaphore) -> None:
+    # A member's grants fold into one diff: every non-color role plus at most
+    # one color (the last one found), with the member's other colors removed.
+    # Per-role add/remove routes never overwrite roles the sweep didn't name.
+    async with sem, _member_lock(member.guild.id, member.id):
+        adds = [role for role, name in grants if name not in COLOR_ROLE_NAMES_CACHE]
+        color = next((role for role, name in reversed(grants) if name in COLOR_ROLE_NAMES_CACHE), None)
+        try:
+            stale: List[discord.Role] = []
+            if color is not None:
+                # Colors are exclusive, so work from the member's live roles.
+                member = await member.guild.fetch_member(member.id)
+                stale = [r for r in member.roles if r.name in COLOR_ROLE_NAMES_CACHE and r.id != color.id]
+                adds.append(color)
+            if stale:
+                await member.remove_roles(*stale, reason="role recovery")
+            await member.add_roles(*adds, reason="role recovery")
+            logging.info(f"[Recovery] Reassigned {', '.join(repr(r.name) for r in adds)} to {member.name}")
+        except discord.Forbidden:
+            logging.warning(f"[Recovery] Forbidden editing member {member.id} in {member.guild.name}")
+        except Exception as e:
+            logging.warning(f"[Recovery] Error user {member.id}: {e}")
 
+async def _seed_reaction_index(guild: discord.Guild, me: discord.Member, panel_name: str, channel_id: int, message_id: int) -> Optional[Dict[str, Set[int]]]:
+    """Read a panel's current reactors over REST; None if it can't be read."""
+    channel = guild.get_channel(channel_id)
+    if channel is None:
+        # Panels are tracked globally; a channel cached under another guild
+        # isn't ours to scan, so don't spend a fetch_channel call just to
+        # have it fail.
+        if bot.get_channel(channel_id) is not None:
+            return None
+        try:
+            channel = await guild.fetch_channel(channel_id)
+        except Exception as e:
+            logging.warning(f"[Recovery] Could not fetch channel {channel_id} for {panel_name} panel in {guild.name}: {e}")
+            return None
+    if not isinstance(channel, discord.TextChannel):
+        return None
+    perms = channel.permissions_for(me)
+    if not (perms.view_channel and perms.read_message_history):
+        return None
     try:
-        await member.remove_roles(role)
-        logging.info(f"[Roles] Removed '{role_name}' from {member.name}")
+        message = await channel.fetch_message(message_id)
+    except discord.NotFound:
+        logging.warning(f"[Recovery] {panel_name} panel message {message_id} was deleted in {guild.name}; clearing it from state")
+        clear_reaction_panel_state(panel_name)
+        return None
     except Exception as e:
-        logging.warning(f"[Roles] Failed removing '{role_name}' from {member}: {e}")
+        logging.warning(f"[Recovery] Could not fetch {panel_name} panel message {message_id} in {guild.name}: {e}")
+        return None
+    if message.author != bot.user:
+        return None
+
+    # Publish the entry before paginating so reaction events that land
+    # mid-seed are folded in rather than dropped.
+    reactors = _REACTION_INDEX.setdefault((guild.id, message_id), {})
+    try:
+        for reaction in message.reactions:
+            emoji = str(reaction.emoji).strip()
+            if not resolve_role_name_from_emoji(emoji):
+                continue
+            users = reactors.setdefault(emoji, set())
+            async for user in reaction.users():
+                if not user.bot:
+                    users.add(user.id)
+    except discord.HTTPException as e:
+        # A partial reactor set would make every later sweep skip the users
+        # it missed; drop it and reseed on the next poll instead.
+        _REACTION_INDEX.pop((guild.id, message_id), None)
+        mark_role_state_dirty()
+        logging.warning(f"[Recovery] Could not read reactions on {panel_name} panel {message_id} in {guild.name}: {e}")
+        return None
+    return reactors
+
+async def _recover_guild(guild: discord.Guild, sem: asyncio.Semaphore) -> None:
+    async with sem:
+        try:
+            me = guild.me
+            if me is None:
+                return
+
+            if not guild.chunked:
+                # One gateway request fills the member cache, so reactors below
+                # resolve via get_member instead of a fetch_member call each.
+                try:
+                    await guild.chunk(cache=True)
+                except Exception as e:
+                    logging.warning(f"[Recovery] Could not chunk members for {guild.name}: {e}")
+
+            # Drop index entries for panels that have since been replaced.
+            for key in [k for k in _REACTION_INDEX if k[0] == guild.id and k[1] not in TRACKED_PANEL_MESSAGE_IDS]:
+                del _REACTION_INDEX[key]
+
+            pending: Dict[int, Tuple[discord.Member, List[Tuple[discord.Role, str]]]] = {}
+
+            for panel_name, channel_id, message_id in reaction_panel_targets_for_guild(guild):
+                reactors = _REACTION_INDEX.get((guild.id, message_id))
+                if reactors is None:
+                    reactors = await _seed_reaction_index(guild, me, panel_name, channel_id, message_id)
+                    if reactors is None:
+                        continue
+
+                for emoji, user_ids in list(reactors.items()):
+                    role_name = resolve_role_name_from_emoji(emoji)
+                    if not role_name:
+                        continue
+
+                    role = guild_role_by_name(guild, role_name)
+                    if not role:
+                        continue
+
+                    for user_id in list(user_ids):
+                        try:
+                            # Members intent is enabled, so the cache is
+                            # usually populated — avoid a per-user API
+                            # call (and rate-limit risk on large panels)
+                            # unless the member truly isn't cached.
+                            member = guild.get_member(user_id) or await guild.fetch_member(user_id)
+                            if member and role not in member.roles:
+                                pending.setdefault(member.id, (member, []))[1].append((role, role_name))
+                        except discord.NotFound:
+                            user_ids.discard(user_id)  # left the guild
+                        except discord.Forbidden:
+                            logging.warning(f"[Recovery] Forbidden fetching member {user_id} in {guild.name}")
+                        except Exception as e:
+                            logging.warning(f"[Recovery] Error user {user_id}: {e}")
+
+            if pending:
+                edit_sem = asyncio.Semaphore(_recovery_concurrency())
+                await asyncio.gather(*(_apply_recovered_roles(m, grants, edit_sem) for m, grants in pending.values()))
+        except Exception as e:
+            logging.error(f"[Recovery] Guild {guild.id} error: {e}")
+
+# Set whenever reaction events may have been missed (startup, gateway
+# disconnect/resume, rolesresync). A dirty sweep drops the reaction index and
+# reseeds it from REST; otherwise the loop only reconciles from the index once
+# per periodic_role_recovery_minutes.
+_ROLE_STATE_DIRTY: bool = True
+_ROLE_RECOVERY_POLL_SECONDS = 60
+
+def mark_role_state_dirty() -> None:
+    global _ROLE_STATE_DIRTY
+    _ROLE_STATE_DIRTY = True
+
+@bot.event
+async def on_disconnect():
+    mark_role_state_dirty()
+
+@bot.event
+async def on_resumed():
+    mark_role_state_dirty()
 
 async def periodic_reaction_role_check():
+    global _ROLE_STATE_DIRTY
     await bot.wait_until_ready()
-    interval_min = 60
+    last_sweep = float("-inf")
 
     while not bot.is_closed():
         _loop_tick("periodic_role_recovery")
         try:
-            reload_config_state()
+            await areload_config_state_if_changed()
             try:
                 interval_min = int(CFG.get("periodic_role_recovery_minutes", 60))
             except Exception:
                 interval_min = 60
             interval_min = max(5, min(240, interval_min))
 
-            for guild in bot.guilds:
-                me = guild.me
-                if me is None:
-                    continue
-
-                for panel_name, channel_id, message_id in reaction_panel_targets_for_guild(guild):
-                    channel = guild.get_channel(channel_id)
-                    if channel is None:
-                        try:
-                            channel = await guild.fetch_channel(channel_id)
-                        except Exception as e:
-                            logging.warning(f"[Recovery] Could not fetch channel {channel_id} for {panel_name} panel in {guild.name}: {e}")
-                            continue
-                    if not isinstance(channel, discord.TextChannel):
-                        continue
-                    perms = channel.permissions_for(me)
-                    if not (perms.view_channel and perms.read_message_history):
-                        continue
-                    try:
-                        message = await channel.fetch_message(message_id)
-                    except Exception as e:
-                        logging.warning(f"[Recovery] Could not fetch {panel_name} panel message {message_id} in {guild.name}: {e}")
-                        continue
-                    if message.author != bot.user:
-                        continue
-
-                    for reaction in message.reactions:
-                        emoji = str(reaction.emoji).strip()
-                        role_name = resolve_role_name_from_emoji(emoji)
-                        if not role_name:
-                            continue
-
-                        role = discord.utils.get(guild.roles, name=role_name)
-                        if not role:
-                            continue
-
-                        async for user in reaction.users():
-                            if user.bot:
-                                continue
-                            try:
-                                # Members intent is enabled, so the cache is
-                                # usually populated — avoid a per-user API
-                                # call (and rate-limit risk on large panels)
-                                # unless the member truly isn't cached.
-                                member = guild.get_member(user.id) or await guild.fetch_member(user.id)
-                                if member and role not in member.roles:
-                                    if role_name in color_role_names():
-                                        roles_to_remove = [
-                                            discord.utils.get(guild.roles, name=rname)
-                                            for rname in color_role_names()
-                                            if rname != role_name
-                                        ]
-                                        remove_list = [r for r in roles_to_remove if r and r in member.roles]
-                                        if remove_list:
-                                            await member.remove_roles(*remove_list)
-                                    await member.add_roles(role)
-                                    logging.info(f"[Recovery] Reassigned '{role_name}' to {member.name}")
-                            except discord.Forbidden:
-                                logging.warning(f"[Recovery] Forbidden fetching member {user.id} in {guild.name}")
-                            except Exception as e:
-                                logging.warning(f"[Recovery] Error user {user.id}: {e}")
+            dirty = _ROLE_STATE_DIRTY
+            if dirty or time.monotonic() - last_sweep >= interval_min * 60:
+                # Clear first so a disconnect during the sweep queues another.
+                _ROLE_STATE_DIRTY = False
+                if dirty:
+                    _REACTION_INDEX.clear()
+                last_sweep = time.monotonic()
+                # Guilds are independent; a slow REST call in one shouldn't hold up
+                # the rest. The semaphore keeps us well inside Discord's budgets.
+                sem = asyncio.Semaphore(5)
+                await asyncio.gather(*(_recover_guild(g, sem) for g in bot.guilds), return_exceptions=True)
 
         except Exception as e:
             _loop_error("periodic_role_recovery")
             logging.error(f"[Recovery] Loop error: {e}")
+            mark_role_state_dirty()
 
-        await asyncio.sleep(interval_min * 60)
+        await asyncio.sleep(_ROLE_RECOVERY_POLL_SECONDS)
+
+@bot.hybrid_command(name="rolesresync", aliases=["roles_resync"])
+@commands.has_permissions(administrator=True)
+async def rolesresync(ctx):
+    """Re-read reaction panels from Discord and restore any missing roles."""
+    mark_role_state_dirty()
+    await ctx.send(f"✅ Reaction roles will be resynced within {_ROLE_RECOVERY_POLL_SECONDS} seconds.")
 
 # ----------------------------
 # XP awarding: on_message
@@ -4898,6 +5454,7 @@ async def _openf1_get(
     endpoint: str,
     params: Dict[str, Any],
     caller: str = "race_live",
+    timeout: float = 20,
 ) -> Any:
     cooldown_s = _openf1_get_endpoint_cooldown_remaining(endpoint)
     if cooldown_s > 0:
@@ -4906,12 +5463,15 @@ async def _openf1_get(
     url = f"{OPENF1_BASE}/{endpoint.lstrip('/')}"
     for attempt in range(2):
         force_refresh = bool(attempt == 1)
+        # A token refresh is a blocking login under _OPENF1_TOKEN_LOCK, which
+        # racereplay/openf1check worker threads also hold; keep it off the loop.
+        headers = await asyncio.to_thread(_openf1_auth_headers, force_refresh)
         t0 = time.time()
         async with http.get(
             url,
             params=params,
-            headers=_openf1_auth_headers(force_refresh=force_refresh),
-            timeout=aiohttp.ClientTimeout(total=20),
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=timeout),
         ) as r:
             latency_ms = int((time.time() - t0) * 1000)
             _openf1_trace_record(
@@ -4932,7 +5492,7 @@ async def _openf1_get(
             elif int(r.status) == 503:
                 _openf1_set_endpoint_cooldown(endpoint, 15)
             r.raise_for_status()
-            return await r.json()
+            return _json_loads(await r.read())
     raise RuntimeError("OpenF1 auth retry exhausted.")
 
 def _session_type_upper(s: Dict[str, Any]) -> str:
@@ -5116,18 +5676,44 @@ async def _fetch_fallback_race_thread_for_guild(
             continue
     return None
 
-async def _get_forum_channel_live(guild: discord.Guild) -> Optional[discord.abc.GuildChannel]:
-    forum_id = os.getenv("RACE_FORUM_CHANNEL_ID")
+# guild id -> forum channel obtained via fetch_channel, so a channel missing
+# from the gateway cache costs one REST call rather than one per thread post.
+# Dropped by on_guild_channel_delete/update, or when posting to it 404s.
+_FORUM_CHANNEL_CACHE: Dict[int, discord.abc.GuildChannel] = {}
+
+async def _resolve_forum_channel(guild: discord.Guild, label: str) -> Optional[discord.abc.GuildChannel]:
+    forum_id = _RACE_TEST_ENV["forum_channel_id"]
     if not forum_id:
         return None
-    try:
-        ch = guild.get_channel(int(forum_id))
-        if ch is None:
-            ch = await guild.fetch_channel(int(forum_id))
+    ch = guild.get_channel(forum_id)
+    if ch is not None:
         return ch
+    cached = _FORUM_CHANNEL_CACHE.get(guild.id)
+    if cached is not None and cached.id == forum_id:
+        return cached
+    try:
+        ch = await guild.fetch_channel(forum_id)
     except Exception as e:
-        logging.error(f"[RaceLive] Could not fetch forum channel {forum_id}: {e}")
+        logging.error(f"[{label}] Could not fetch forum channel {forum_id}: {e}")
         return None
+    _FORUM_CHANNEL_CACHE[guild.id] = ch
+    return ch
+
+def _forget_forum_channel(channel: discord.abc.GuildChannel) -> None:
+    cached = _FORUM_CHANNEL_CACHE.get(channel.guild.id)
+    if cached is not None and cached.id == channel.id:
+        del _FORUM_CHANNEL_CACHE[channel.guild.id]
+
+@bot.event
+async def on_guild_channel_delete(channel: discord.abc.GuildChannel):
+    _forget_forum_channel(channel)
+
+@bot.event
+async def on_guild_channel_update(before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+    _forget_forum_channel(after)
+
+async def _get_forum_channel_live(guild: discord.Guild) -> Optional[discord.abc.GuildChannel]:
+    return await _resolve_forum_channel(guild, "RaceLive")
 
 async def _create_race_thread(
     guild: discord.Guild,
@@ -5147,13 +5733,18 @@ async def _create_race_thread(
         }
         if opener_file is not None:
             create_kwargs["file"] = opener_file
-        created = await ch.create_thread(**create_kwargs)
-        if isinstance(created, tuple) and len(created) >= 1:
-            return created[0]
-        return created
+        try:
+            return (await ch.create_thread(**create_kwargs)).thread
+        except discord.NotFound:
+            _forget_forum_channel(ch)
+            raise
 
     if isinstance(ch, discord.TextChannel):
-        msg = await ch.send(f"Race Thread: **{title}**")
+        try:
+            msg = await ch.send(f"Race Thread: **{title}**")
+        except discord.NotFound:
+            _forget_forum_channel(ch)
+            raise
         thread = await msg.create_thread(name=title, auto_archive_duration=1440)
         if opener_file is not None:
             await thread.send(opener_text, file=opener_file)
@@ -6120,8 +6711,71 @@ async def racelivestop(ctx):
 #   - commands renamed to NO underscores
 # ============================================================
 
+# Race test / race thread env settings, parsed once. configreload re-reads
+# .env and then calls _refresh_race_test_env().
+_RACE_TEST_ENV: Dict[str, Any] = {}
+
+def _refresh_race_test_env() -> None:
+    try:
+        speed = float(os.getenv("RACE_TEST_SPEED", "1.0"))
+    except ValueError:
+        speed = 1.0
+    _RACE_TEST_ENV.update(
+        forum_channel_id=_env_int("RACE_FORUM_CHANNEL_ID"),
+        default_scenario=(os.getenv("RACE_TEST_DEFAULT_SCENARIO") or "practice_short").strip(),
+        speed=speed,
+        scenarios_file=(os.getenv("RACE_SCENARIOS_FILE") or "").strip(),
+    )
+
+_refresh_race_test_env()
+
 # In-memory tasks so you can stop a running test
 RACE_TEST_TASKS: Dict[int, asyncio.Task] = {}  # key: guild_id
+# Stop flags checked by the runners between events. Stopping is cooperative so
+# a run never gets cancelled halfway through a send or a rate-limit backoff.
+RACE_TEST_STOPS: Dict[int, asyncio.Event] = {}  # key: guild_id
+_RACE_TEST_STOP_GRACE = 15.0  # seconds to wait for a cooperative stop before cancelling
+
+def _track_race_test_task(guild_id: int, task: asyncio.Task, stop: asyncio.Event) -> None:
+    RACE_TEST_TASKS[guild_id] = task
+    RACE_TEST_STOPS[guild_id] = stop
+
+    def _drop(t: asyncio.Task) -> None:
+        # Only drop our own entry; a newer run may already have replaced it.
+        if RACE_TEST_TASKS.get(guild_id) is t:
+            del RACE_TEST_TASKS[guild_id]
+            RACE_TEST_STOPS.pop(guild_id, None)
+
+    task.add_done_callback(_drop)
+
+async def _stop_race_test(guild_id: int) -> bool:
+    """Ask the guild's running test to stop and wait for it. True if one was running."""
+    task = RACE_TEST_TASKS.get(guild_id)
+    if task is None or task.done():
+        return False
+    stop = RACE_TEST_STOPS.get(guild_id)
+    if stop is not None:
+        stop.set()
+    try:
+        await asyncio.wait_for(asyncio.shield(task), _RACE_TEST_STOP_GRACE)
+    except asyncio.TimeoutError:
+        # Still stuck in a send after the grace period; fall back to cancelling.
+        task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, Exception):
+            pass
+    except (asyncio.CancelledError, Exception):
+        pass
+    return True
+
+async def _race_test_pause(stop: asyncio.Event, seconds: float) -> bool:
+    """Sleep up to `seconds`; returns True (early) if the run was asked to stop."""
+    try:
+        await asyncio.wait_for(stop.wait(), seconds)
+    except asyncio.TimeoutError:
+        return False
+    return True
 
 # Built-in default scenarios (config-friendly shape)
 DEFAULT_RACE_SCENARIOS: Dict[str, Dict[str, Any]] = {
@@ -6170,20 +6824,44 @@ EVENT_STYLE = {
     "INFO":          ("\u2139\uFE0F", "**Info**"),
 }
 
-def _scenario_meta(scenario: Dict[str, Any]) -> Dict[str, Any]:
-    return dict(scenario.get("meta") or {})
+# Race test events due within this many real seconds of each other share a message.
+_RACE_TEST_COALESCE_SECONDS = 1.5
+
+# Event types that may post spoiler follow-ups (classification / knockouts).
+_FOLLOWUP_EVENT_TYPES = frozenset({"CLASSIFICATION_READY", "RESULTS_READY", "SEGMENT_END"})
+
+# These accessors run at load time (see _normalize_scenario), so they take
+# whatever shape a scenario file has and fall back rather than raise.
+def _scenario_meta(scenario: Dict[str, Any]) -> Mapping[str, Any]:
+    # Read-only view; callers only .get() from it.
+    meta = scenario.get("meta")
+    return meta if isinstance(meta, dict) else {}
 
 def _scenario_title(scenario: Dict[str, Any], fallback: str) -> str:
     meta = _scenario_meta(scenario)
-    return (meta.get("title") or scenario.get("title") or fallback).strip()
+    return str(meta.get("title") or scenario.get("title") or fallback).strip()
+
+def _scenario_results(scenario: Dict[str, Any]) -> List[Any]:
+    cls = scenario.get("classification")
+    results = cls.get("results") if isinstance(cls, dict) else None
+    return results if isinstance(results, list) else []
 
+# Normalized scenarios carry "_session" / "_grid_map" precomputed by
+# _normalize_scenario, so followups and result formatters don't rebuild them.
 def _scenario_session(scenario: Dict[str, Any]) -> str:
+    cached = scenario.get("_session")
+    if cached is not None:
+        return cached
     meta = _scenario_meta(scenario)
     return str(meta.get("session") or "").upper().strip()
 
 def _scenario_grid_map(scenario: Dict[str, Any]) -> Dict[str, str]:
+    cached = scenario.get("_grid_map")
+    if cached is not None:
+        return cached
     out: Dict[str, str] = {}
-    for d in (scenario.get("grid") or []):
+    grid = scenario.get("grid")
+    for d in (grid if isinstance(grid, list) else []):
         if not isinstance(d, dict):
             continue
         did = str(d.get("id") or "").strip()
@@ -6193,8 +6871,7 @@ def _scenario_grid_map(scenario: Dict[str, Any]) -> Dict[str, str]:
     return out
 
 def _format_race_classification(scenario: Dict[str, Any]) -> str:
-    cls = scenario.get("classification") or {}
-    results = cls.get("results") or []
+    results = _scenario_results(scenario)
     grid = _scenario_grid_map(scenario)
     lines: List[str] = []
     for r in results:
@@ -6219,8 +6896,7 @@ def _format_race_classification(scenario: Dict[str, Any]) -> str:
     return "\n".join(lines)
 
 def _format_quali_classification(scenario: Dict[str, Any]) -> str:
-    cls = scenario.get("classification") or {}
-    results = cls.get("results") or []
+    results = _scenario_results(scenario)
     grid = _scenario_grid_map(scenario)
     lines: List[str] = []
     for r in results:
@@ -6249,12 +6925,14 @@ def _format_quali_classification(scenario: Dict[str, Any]) -> str:
     return "\n".join(lines)
 
 def _wrap_spoiler(text: str) -> str:
-    return "\n".join(f"||{line}||" for line in text.splitlines())
+    # Discord spoilers span lines, so one pair covers the whole block; a stray
+    # "||" inside would close it early, so break those with a zero-width space.
+    return "||" + text.replace("||", "|\u200b|") + "||"
 
-def _race_event_recap(events: List[Dict[str, Any]]) -> str:
+def _race_event_recap(events: Sequence[Dict[str, Any]]) -> str:
     counts: Dict[str, int] = {}
     for ev in events:
-        etype = str((ev or {}).get("type") or "INFO").upper().strip()
+        etype = ev["type"]
         counts[etype] = counts.get(etype, 0) + 1
     if not counts:
         return "No events recorded."
@@ -6268,30 +6946,204 @@ def _race_event_recap(events: List[Dict[str, Any]]) -> str:
             lines.append(f"- {k}: **{counts[k]}**")
     return "\n".join(lines)
 
-def _load_race_scenarios() -> Dict[str, Dict[str, Any]]:
-    path = (os.getenv("RACE_SCENARIOS_FILE") or "").strip()
+def _race_scenarios_path() -> str:
+    path = _RACE_TEST_ENV["scenarios_file"]
     if not path:
         path = os.path.join(os.path.dirname(__file__), "scenario.json")
+    return path
 
-    logging.info(f"[RaceTest] Loading scenarios from: {path}")
+def _render_scenario_event_text(scenario: Dict[str, Any], event: Dict[str, Any], grid_map: Dict[str, str]) -> str:
+    etype = event["type"]
+    emoji, label = EVENT_STYLE.get(etype, ("\u2139\uFE0F", "**Info**"))
+    segment = str(event.get("segment") or "").strip().upper()
 
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+    if etype == "PURPLE_SECTOR":
+        did = str(event.get("driver_id") or "").strip()
+        name = grid_map.get(did, did or "Unknown")
+        sector = event.get("sector")
+        lap = str(event.get("lap") or "").strip()
+        seg_txt = f" ({segment})" if segment else ""
+        sec_txt = f"S{sector}" if sector is not None else "sector"
+        text = f"{emoji} {name} sets purple {sec_txt}{seg_txt}"
+        if lap:
+            text += f" — {lap}"
+        return text
+
+    if etype in ("SEGMENT_START", "SEGMENT_END") and segment:
+        label = f"**{segment} {'started' if etype == 'SEGMENT_START' else 'ended'}**"
+
+    if etype == "SESSION_START":
+        use_session = event["session"] or _scenario_session(scenario)
+        suffix = f" ({use_session})" if use_session else ""
+    else:
+        suffix = ""
+
+    text = f"{emoji} {label}{suffix}"
+    if event["detail"]:
+        text += f"\n{event['detail']}"
+    return text
+
+def _scenario_problem(scenario: Any) -> Optional[str]:
+    """Return why a scenario is malformed, or None. Checked once per load."""
+    if not isinstance(scenario, dict):
+        return "scenario must be an object"
+    events = scenario.get("events")
+    if not isinstance(events, list) or not events:
+        return "'events' must be a non-empty list"
+    for i, ev in enumerate(events):
+        if not isinstance(ev, dict):
+            return f"event #{i} must be an object"
+        # Normalization runs float() on 't' and str() on 'type'/'session', so
+        # "12" or a numeric session is fine; only reject what would raise.
+        t = ev.get("t")
+        if t is not None:
+            try:
+                float(t)
+            except (TypeError, ValueError):
+                return f"event #{i}: 't' must be a number (got {t!r})"
+        detail = ev.get("detail")
+        if detail is not None and not isinstance(detail, str):
+            return f"event #{i}: 'detail' must be a string (got {type(detail).__name__})"
+    cls = scenario.get("classification")
+    if cls is None:
+        return None
+    if not isinstance(cls, dict):
+        return "'classification' must be an object"
+    results = cls.get("results")
+    if results is None:
+        return None
+    if not isinstance(results, list):
+        return "'classification.results' must be a list"
+    # Formatters render positions with int(), so anything int() accepts
+    # (ints, "3") is fine; only reject what would raise mid-render.
+    for i, r in enumerate(results):
+        pos = r.get("pos") if isinstance(r, dict) else None
+        if pos is None:
+            continue
+        try:
+            int(pos)
+        except (TypeError, ValueError):
+            return f"classification result #{i}: 'pos' must be a number (got {pos!r})"
+    return None
+
+def _normalize_scenario_event(e: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        **e,
+        "t": float(e.get("t") or 0),
+        "type": str(e.get("type") or "INFO").upper().strip(),
+        "detail": str(e.get("detail") or "").strip(),
+        "session": str(e.get("session") or "").strip(),
+    }
+
+def _scenario_stats(scenario: Dict[str, Any], event_count: int) -> Dict[str, Any]:
+    # Counts racetestinfo reports; fixed per scenario file.
+    grid = scenario.get("grid")
+    segments = scenario.get("segments")
+    return {
+        "events": event_count,
+        "grid": len(grid) if isinstance(grid, list) else 0,
+        "segments": len(segments) if isinstance(segments, list) else 0,
+        "has_cls": bool(_scenario_results(scenario)),
+    }
+
+def _normalize_scenario(scenario: Dict[str, Any]) -> Dict[str, Any]:
+    """Sort + normalize a scenario's events once, at load, so replays don't.
+
+    Expects a scenario that passed _scenario_problem().
+    """
+    normalized = sorted(map(_normalize_scenario_event, scenario["events"]), key=itemgetter("t"))
+    grid_map = _scenario_grid_map(scenario)
+    session = _scenario_session(scenario)
+    for ev in normalized:
+        ev["text"] = _render_scenario_event_text(scenario, ev, grid_map)
+    t0 = normalized[0]["t"]
+    # batches: (seconds from the first event, events) — consecutive events at
+    # the same instant go out as one message. A batch closes after any event
+    # with spoiler follow-ups so those still land right after their event.
+    batches: List[Tuple[float, Tuple[Dict[str, Any], ...]]] = []
+    cur: List[Dict[str, Any]] = []
+    for ev in normalized:
+        if cur and (ev["t"] != cur[-1]["t"] or cur[-1]["type"] in _FOLLOWUP_EVENT_TYPES):
+            batches.append((cur[0]["t"] - t0, tuple(cur)))
+            cur = []
+        cur.append(ev)
+    batches.append((cur[0]["t"] - t0, tuple(cur)))
+    return {
+        **scenario,
+        "events": tuple(normalized),
+        "batches": tuple(batches),
+        "_session": session,
+        "_grid_map": grid_map,
+        # Static per scenario file, so rendered once here for results/followups.
+        "_race_body": _format_race_classification(scenario) if session == "RACE" else None,
+        "_quali_body": _format_quali_classification(scenario) if session in ("QUALI", "QUALIFYING") else None,
+        "_stats": _scenario_stats(scenario, len(normalized)),
+    }
 
-        merged = dict(DEFAULT_RACE_SCENARIOS)
-        merged.update(data or {})
+def _scenario_name_index(scenarios: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+    # casefolded name -> real key, for case-insensitive lookups
+    return {k.casefold(): k for k in scenarios}
 
-        logging.info(f"[RaceTest] Loaded scenarios OK: {list(data.keys())}")
-        return merged
+# Built-ins normalized once at import and frozen, so every fallback hands out
+# the same read-only mapping instead of a fresh copy.
+_DEFAULT_SCENARIOS_NORMALIZED: Mapping[str, Dict[str, Any]] = MappingProxyType(
+    {k: _normalize_scenario(v) for k, v in DEFAULT_RACE_SCENARIOS.items()}
+)
+_DEFAULT_SCENARIO_INDEX: Mapping[str, str] = MappingProxyType(_scenario_name_index(DEFAULT_RACE_SCENARIOS))
+
+@functools.lru_cache(maxsize=8)
+def _load_scenarios_cached(path: str, mtime_ns: int) -> Tuple[Mapping[str, Dict[str, Any]], Mapping[str, str]]:
+    # mtime_ns is only part of the cache key: editing the file invalidates it.
+    logging.info(f"[RaceTest] Loading scenarios from: {path}")
+    with open(path, "rb") as f:
+        data = _json_loads(f.read())
+
+    if not isinstance(data, dict):
+        raise ValueError("scenario file must be a JSON object of name -> scenario")
+
+    merged = dict(_DEFAULT_SCENARIOS_NORMALIZED)
+    loaded: List[str] = []
+    for k, v in data.items():
+        # A bad scenario only costs itself; the rest of the file still loads.
+        problem = _scenario_problem(v)
+        if problem is None:
+            try:
+                merged[k] = _normalize_scenario(v)
+                loaded.append(k)
+                continue
+            except Exception as e:
+                problem = f"could not be prepared ({e})"
+        logging.warning(f"[RaceTest] Skipping scenario '{k}': {problem}")
 
+    logging.info(f"[RaceTest] Loaded scenarios OK: {loaded}")
+    return merged, _scenario_name_index(merged)
+
+def _load_race_scenarios_indexed() -> Tuple[Mapping[str, Dict[str, Any]], Mapping[str, str]]:
+    explicit = bool(_RACE_TEST_ENV["scenarios_file"])
+    path = _race_scenarios_path()
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError as e:
+        # A missing bundled scenario.json just means "built-ins only"; only an
+        # explicitly configured file is worth an error on every lookup.
+        if explicit:
+            logging.error(f"[RaceTest] Failed to load scenario.json, using defaults: {e}")
+        return _DEFAULT_SCENARIOS_NORMALIZED, _DEFAULT_SCENARIO_INDEX
+    try:
+        return _load_scenarios_cached(path, mtime_ns)
     except Exception as e:
         logging.error(f"[RaceTest] Failed to load scenario.json, using defaults: {e}")
-        return DEFAULT_RACE_SCENARIOS
+        return _DEFAULT_SCENARIOS_NORMALIZED, _DEFAULT_SCENARIO_INDEX
+
+def _load_race_scenarios() -> Mapping[str, Dict[str, Any]]:
+    return _load_race_scenarios_indexed()[0]
+
+def _reload_scenarios() -> None:
+    """Forget every cached scenario file; the next lookup re-reads from disk."""
+    _load_scenarios_cached.cache_clear()
 
 def _format_quali_knockouts(scenario: Dict[str, Any], knocked_in: str) -> str:
-    cls = scenario.get("classification") or {}
-    results = cls.get("results") or []
+    results = _scenario_results(scenario)
     grid = _scenario_grid_map(scenario)
 
     knocked_in = (knocked_in or "").upper().strip()
@@ -6322,149 +7174,156 @@ def _format_quali_knockouts(scenario: Dict[str, Any], knocked_in: str) -> str:
     return "\n".join(lines)
 
 async def _get_forum_channel(guild: discord.Guild) -> Optional[discord.abc.GuildChannel]:
-    forum_id = os.getenv("RACE_FORUM_CHANNEL_ID")
-    if not forum_id:
-        return None
-    try:
-        ch = guild.get_channel(int(forum_id))
-        if ch is None:
-            ch = await guild.fetch_channel(int(forum_id))
-        return ch
-    except Exception as e:
-        logging.error(f"[RaceTest] Could not fetch forum channel {forum_id}: {e}")
-        return None
-
-async def _ensure_test_thread(guild: discord.Guild, title: str) -> Optional[discord.Thread]:
-    ch = await _get_forum_channel(guild)
-    if ch is None:
-        return None
+    return await _resolve_forum_channel(guild, "RaceTest")
 
+async def _create_forum_test_thread(ch: discord.ForumChannel, title: str) -> Optional[discord.Thread]:
     try:
-        if isinstance(ch, discord.ForumChannel):
-            created = await ch.create_thread(
-                name=title,
-                content=f"🧪 Race test thread created by {bot.user.mention}",
-                auto_archive_duration=1440,
-            )
-            if isinstance(created, tuple) and len(created) >= 1:
-                return created[0]
-            return created
+        # discord.py 2.x (pinned in requirements.txt) returns ThreadWithMessage.
+        created = await ch.create_thread(
+            name=title,
+            content=f"🧪 Race test thread created by {bot.user.mention}",
+            auto_archive_duration=1440,
+        )
+        return created.thread
+    except discord.NotFound as e:
+        _forget_forum_channel(ch)
+        logging.error(f"[RaceTest] Forum channel {ch.id} is gone: {e}")
+        return None
     except Exception as e:
         logging.error(f"[RaceTest] Forum create_thread failed: {e}")
+        return None
 
+async def _create_text_test_thread(ch: discord.TextChannel, title: str) -> Optional[discord.Thread]:
     try:
-        if isinstance(ch, discord.TextChannel):
-            msg = await ch.send(f"🧪 Race test thread: **{title}**")
-            th = await msg.create_thread(name=title, auto_archive_duration=1440)
-            return th
+        msg = await ch.send(f"🧪 Race test thread: **{title}**")
+        return await msg.create_thread(name=title, auto_archive_duration=1440)
+    except discord.NotFound as e:
+        _forget_forum_channel(ch)
+        logging.error(f"[RaceTest] Channel {ch.id} is gone: {e}")
+        return None
     except Exception as e:
         logging.error(f"[RaceTest] Text thread creation failed: {e}")
+        return None
 
-    return None
-
-async def _emit_race_event(thread: discord.Thread, scenario: Dict[str, Any], event: Dict[str, Any], grid_map: Dict[str, str]) -> None:
-    etype = (event.get("type") or "INFO").upper().strip()
-    emoji, label = EVENT_STYLE.get(etype, ("\u2139\uFE0F", "**Info**"))
+# channel type -> coroutine that opens a race test thread in it
+_TEST_THREAD_FACTORIES = {
+    discord.ForumChannel: _create_forum_test_thread,
+    discord.TextChannel: _create_text_test_thread,
+}
 
+async def _ensure_test_thread(guild: discord.Guild, title: str) -> Optional[discord.Thread]:
+    ch = await _get_forum_channel(guild)
+    if ch is None:
+        return None
+    factory = _TEST_THREAD_FACTORIES.get(type(ch))
+    if factory is None:
+        return None
+    return await factory(ch, title)
+
+async def _emit_race_batch(thread: discord.Thread, scenario: Dict[str, Any], batch: Sequence[Dict[str, Any]]) -> None:
+    # "text" is rendered once by _normalize_scenario.
+    for chunk in _chunk_lines("\n".join(ev["text"] for ev in batch)):
+        await thread.send(chunk)
+    for ev in batch:
+        if ev["type"] in _FOLLOWUP_EVENT_TYPES:
+            await _emit_race_event_followups(thread, scenario, ev)
+
+async def _emit_race_event_followups(thread: discord.Thread, scenario: Dict[str, Any], event: Dict[str, Any]) -> None:
+    etype = event["type"]
     scenario_session = _scenario_session(scenario)
-    ev_session = str(event.get("session") or "").strip()
-    segment = str(event.get("segment") or "").strip().upper()
-
-    if etype == "PURPLE_SECTOR":
-        did = str(event.get("driver_id") or "").strip()
-        name = grid_map.get(did, did or "Unknown")
-        sector = event.get("sector")
-        lap = str(event.get("lap") or "").strip()
-        seg_txt = f" ({segment})" if segment else ""
-        sec_txt = f"S{sector}" if sector is not None else "sector"
-        text = f"{emoji} {name} sets purple {sec_txt}{seg_txt}"
-        if lap:
-            text += f" — {lap}"
-        await thread.send(text)
-        return
-
-    if etype in ("SEGMENT_START", "SEGMENT_END") and segment:
-        label = f"**{segment} {'started' if etype == 'SEGMENT_START' else 'ended'}**"
-
-    detail = (event.get("detail") or "").strip()
-
-    if etype == "SESSION_START":
-        use_session = ev_session or scenario_session
-        suffix = f" ({use_session})" if use_session else ""
-    else:
-        suffix = ""
-
-    text = f"{emoji} {label}{suffix}"
-    if detail:
-        text += f"\n{detail}"
-
-    await thread.send(text)
 
     if etype in ("CLASSIFICATION_READY", "RESULTS_READY"):
         session_type = scenario_session
         if session_type == "RACE" and etype == "CLASSIFICATION_READY":
-            body = _format_race_classification(scenario)
+            body = scenario.get("_race_body") or _format_race_classification(scenario)
             await thread.send(_wrap_spoiler("📊 Race Classification\n" + body))
         elif session_type in ("QUALI", "QUALIFYING") and etype == "RESULTS_READY":
-            body = _format_quali_classification(scenario)
+            body = scenario.get("_quali_body") or _format_quali_classification(scenario)
             await thread.send(_wrap_spoiler("📊 Qualifying Results\n" + body))
 
+    segment = str(event.get("segment") or "").strip().upper()
     if etype == "SEGMENT_END" and scenario_session in ("QUALI", "QUALIFYING") and segment in ("Q1", "Q2"):
         body = _format_quali_knockouts(scenario, segment)
         await thread.send(_wrap_spoiler(f"🚫 {segment} Knockouts\n{body}"))
 
-async def _run_race_test_scenario(guild: discord.Guild, scenario_name: str, speed: float = 1.0) -> None:
-    scenarios = _load_race_scenarios()
-    scenario = scenarios.get(scenario_name)
-
-    if not scenario:
-        for k, v in scenarios.items():
-            if k.lower() == scenario_name.lower():
-                scenario_name = k
-                scenario = v
-                break
-
-    if not scenario:
-        raise RuntimeError(f"Scenario '{scenario_name}' not found.")
+async def _run_race_test_scenario(
+    guild: discord.Guild,
+    scenario_name: str,
+    speed: float = 1.0,
+    stop: Optional[asyncio.Event] = None,
+) -> None:
+    scenario_name, scenario = _resolve_scenario(scenario_name)
 
     title = _scenario_title(scenario, fallback=f"Race Test - {scenario_name}")
-    events = scenario.get("events") or []
-    if not isinstance(events, list) or not events:
-        raise RuntimeError(f"Scenario '{scenario_name}' has no events.")
+    # Shape was validated at load: events is a non-empty, normalized tuple.
+    events = scenario["events"]
 
-    grid_map = _scenario_grid_map(scenario)
     thread = await _ensure_test_thread(guild, title)
     if thread is None:
         raise RuntimeError("Could not create or access the race forum/thread. Check RACE_FORUM_CHANNEL_ID and bot perms.")
 
-    events_sorted = sorted(events, key=lambda e: float(e.get("t", 0)))
     await thread.send(f"🧪 Starting scenario: **{scenario_name}**\nSpeed: **x{speed}**")
 
-    last_t = float(events_sorted[0].get("t", 0))
-    for ev in events_sorted:
-        cur_t = float(ev.get("t", last_t))
-        dt = max(0.0, cur_t - last_t)
-        last_t = cur_t
-        sleep_for = dt / max(0.01, float(speed))
-        if sleep_for > 0:
-            await asyncio.sleep(sleep_for)
-        await _emit_race_event(thread, scenario, ev, grid_map)
-
-    recap = _race_event_recap(events_sorted)
+    # Every batch is scheduled up front at its absolute deadline, so slow
+    # sends never push later events back; the timers only enqueue, and this
+    # coroutine does the Discord sends in order. Setting `stop` drops a
+    # sentinel into the queue, so the run ends between sends, never mid-send.
+    stop = stop or asyncio.Event()
+    inv_speed = 1.0 / max(0.01, float(speed))
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    # Batches landing within _RACE_TEST_COALESCE_SECONDS of real time after
+    # a group's first batch go out with it as one message, so fast playback
+    # doesn't burn a POST per event. A group still closes after an event with
+    # follow-ups. One timer per instant: timers due at the same moment have
+    # no guaranteed order, so same-instant groups (and the end sentinel) ride
+    # together.
+    due: Dict[float, List[Any]] = {}
+    group_at, group = 0.0, []
+    for offset, batch in scenario["batches"]:
+        at = offset * inv_speed
+        if group and at - group_at < _RACE_TEST_COALESCE_SECONDS and group[-1]["type"] not in _FOLLOWUP_EVENT_TYPES:
+            group.extend(batch)
+            continue
+        if group:
+            due.setdefault(group_at, []).append(tuple(group))
+        group_at, group = at, list(batch)
+    due.setdefault(group_at, []).append(tuple(group))
+    due[group_at].append(None)
+
+    def _enqueue(items: List[Any]) -> None:
+        for item in items:
+            queue.put_nowait(item)
+
+    start = loop.time()
+    handles = [loop.call_at(start + at, _enqueue, items) for at, items in due.items()]
+    stop_waiter = asyncio.create_task(stop.wait())
+    stop_waiter.add_done_callback(lambda _: queue.put_nowait(None))
+    try:
+        while (batch := await queue.get()) is not None and not stop.is_set():
+            await _emit_race_batch(thread, scenario, batch)
+    finally:
+        for h in handles:
+            h.cancel()
+        stop_waiter.cancel()
+
+    if stop.is_set():
+        logging.info(f"[RaceTest] Stopped scenario '{scenario_name}'")
+        return
+
+    recap = _race_event_recap(events)
     await thread.send("✅ Scenario complete.")
     await thread.send("📦 **Session Recap**\n" + recap)
 
 def _resolve_scenario(scenario_name: str) -> Tuple[str, Dict[str, Any]]:
-    scenarios = _load_race_scenarios()
+    scenarios, index = _load_race_scenarios_indexed()
     name = (scenario_name or "").strip()
     if not name:
         raise RuntimeError("Scenario name is required.")
-    scenario = scenarios.get(name)
+    key = name if name in scenarios else index.get(name.casefold())
+    scenario = scenarios.get(key) if key else None
     if scenario:
-        return name, scenario
-    for k, v in scenarios.items():
-        if k.lower() == name.lower():
-            return k, v
+        return key, scenario
     raise RuntimeError(f"Scenario '{name}' not found.")
 
 @bot.command(name="racetestlist", aliases=["race_test_list"])
@@ -6474,6 +7333,13 @@ async def racetestlist(ctx):
     names = sorted(scenarios.keys())
     await ctx.send("\U0001F9EA **Race test scenarios:**\n" + "\n".join(f"- `{n}`" for n in names))
 
+@bot.command(name="racetestreload", aliases=["race_test_reload"])
+@commands.has_permissions(administrator=True)
+async def racetestreload(ctx):
+    _reload_scenarios()
+    scenarios = await asyncio.to_thread(_load_race_scenarios)
+    await ctx.send(f"\U0001F9EA Reloaded race test scenarios ({len(scenarios)} available).")
+
 @bot.command(name="racetestinfo", aliases=["race_test_info"])
 @commands.has_permissions(administrator=True)
 async def racetestinfo(ctx, scenario: str):
@@ -6485,20 +7351,17 @@ async def racetestinfo(ctx, scenario: str):
 
     title = _scenario_title(sc, fallback=name)
     session_type = _scenario_session(sc) or "(none)"
-    events = sc.get("events") or []
-    grid = sc.get("grid") or []
-    segments = sc.get("segments") or []
-    has_cls = bool((sc.get("classification") or {}).get("results"))
+    stats = sc["_stats"]
 
     await ctx.send(
         "\U0001F9EA **Scenario info**\n"
         f"- **Key:** `{name}`\n"
         f"- **Title:** {title}\n"
         f"- **Session:** `{session_type}`\n"
-        f"- **Events:** {len(events) if isinstance(events, list) else 0}\n"
-        f"- **Grid drivers:** {len(grid) if isinstance(grid, list) else 0}\n"
-        f"- **Segments:** {len(segments) if isinstance(segments, list) else 0}\n"
-        f"- **Has classification:** {'yes' if has_cls else 'no'}"
+        f"- **Events:** {stats['events']}\n"
+        f"- **Grid drivers:** {stats['grid']}\n"
+        f"- **Segments:** {stats['segments']}\n"
+        f"- **Has classification:** {'yes' if stats['has_cls'] else 'no'}"
     )
 
 @bot.command(name="racetestresults", aliases=["race_test_results"])
@@ -6512,10 +7375,10 @@ async def racetestresults(ctx, scenario: str):
 
     session_type = _scenario_session(sc)
     if session_type == "RACE":
-        body = _format_race_classification(sc)
+        body = sc.get("_race_body") or _format_race_classification(sc)
         await ctx.send(_wrap_spoiler("\U0001F4CA Race Classification\n" + body))
     elif session_type in ("QUALI", "QUALIFYING"):
-        body = _format_quali_classification(sc)
+        body = sc.get("_quali_body") or _format_quali_classification(sc)
         await ctx.send(_wrap_spoiler("\U0001F4CA Qualifying Results\n" + body))
     else:
         await ctx.send(f"\u2139\uFE0F Scenario `{name}` has unknown session type `{session_type}`; no formatter yet.")
@@ -6528,26 +7391,21 @@ async def raceteststart(ctx, scenario: str = None, speed: float = None):
         await ctx.send("❌ Must be run in a server.")
         return
 
-    scenario = (scenario or os.getenv("RACE_TEST_DEFAULT_SCENARIO") or "practice_short").strip()
+    scenario = (scenario or _RACE_TEST_ENV["default_scenario"]).strip()
     try:
         if speed is None:
-            speed = float(os.getenv("RACE_TEST_SPEED", "1.0"))
+            speed = _RACE_TEST_ENV["speed"]
         speed = float(speed)
         speed = max(0.1, min(50.0, speed))
     except Exception:
         speed = 1.0
 
-    existing = RACE_TEST_TASKS.get(guild.id)
-    if existing and not existing.done():
-        existing.cancel()
-        try:
-            await existing
-        except (asyncio.CancelledError, Exception):
-            pass
+    await _stop_race_test(guild.id)
+    stop = asyncio.Event()
 
     async def runner():
         try:
-            await _run_race_test_scenario(guild, scenario, speed=speed)
+            await _run_race_test_scenario(guild, scenario, speed=speed, stop=stop)
         except asyncio.CancelledError:
             logging.info(f"[RaceTest] Cancelled scenario '{scenario}'")
         except Exception as e:
@@ -6557,8 +7415,7 @@ async def raceteststart(ctx, scenario: str = None, speed: float = None):
             except Exception:
                 pass
 
-    task = asyncio.create_task(runner())
-    RACE_TEST_TASKS[guild.id] = task
+    _track_race_test_task(guild.id, asyncio.create_task(runner()), stop)
 
     await ctx.send(f"\U0001F9EA Starting race test: `{scenario}` (speed x{speed})")
 
@@ -6568,13 +7425,7 @@ async def raceteststop(ctx):
     guild = ctx.guild
     if not guild:
         return
-    t = RACE_TEST_TASKS.get(guild.id)
-    if t and not t.done():
-        t.cancel()
-        try:
-            await t
-        except (asyncio.CancelledError, Exception):
-            pass
+    if await _stop_race_test(guild.id):
         await ctx.send("🛑 Race test stopped.")
     else:
         await ctx.send("ℹ️ No race test running.")
@@ -6957,13 +7808,8 @@ async def racereplay(ctx, year: int, round_num: int, speed: float = 10.0):
     max_events = int(os.getenv("RACE_REPLAY_MAX_EVENTS", "350") or 350)
     max_events = max(50, min(2000, max_events))
 
-    existing = RACE_TEST_TASKS.get(guild.id)
-    if existing and not existing.done():
-        existing.cancel()
-        try:
-            await existing
-        except (asyncio.CancelledError, Exception):
-            pass
+    await _stop_race_test(guild.id)
+    stop = asyncio.Event()
 
     async def runner():
         try:
@@ -6994,12 +7840,12 @@ async def racereplay(ctx, year: int, round_num: int, speed: float = 10.0):
                 await ctx.send("\u274C OpenF1 race session is missing `session_key`.")
                 return
 
-            rc = await asyncio.to_thread(
-                _openf1_get_json,
+            rc = await _openf1_get(
+                _http_session(),
                 "race_control",
                 {"session_key": session_key},
-                30,
-                "racereplay_race_control",
+                caller="racereplay_race_control",
+                timeout=30,
             )
             if not isinstance(rc, list) or not rc:
                 await ctx.send("\u274C No race-control events returned for that session.")
@@ -7040,7 +7886,10 @@ async def racereplay(ctx, year: int, round_num: int, speed: float = 10.0):
             for dt, msg in cleaned:
                 if prev_dt is not None:
                     raw_wait = max(0.0, (dt - prev_dt).total_seconds()) / speed
-                    await asyncio.sleep(min(3.0, raw_wait))
+                    if await _race_test_pause(stop, min(3.0, raw_wait)):
+                        return
+                elif stop.is_set():
+                    return
                 await thread.send(f"\U0001F3C1 {msg}")
                 prev_dt = dt
 
@@ -7054,7 +7903,7 @@ async def racereplay(ctx, year: int, round_num: int, speed: float = 10.0):
             except Exception:
                 pass
 
-    RACE_TEST_TASKS[guild.id] = asyncio.create_task(runner())
+    _track_race_test_task(guild.id, asyncio.create_task(runner()), stop)
     await ctx.send(f"\U0001F9EA Queued replay for `{year}` round `{round_num}` at `x{speed}`.")
 
 # ─────────────────────────────────────────────────────────────
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class TTLCache:
+    """key -> (fetch time, value); reads older than the caller's TTL miss."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._rows: Dict[str, Tuple[float, Any]] = {}
+
+    def get(self, key: str, ttl: float) -> Optional[Tuple[float, Any]]:
+        hit = self._rows.get(key)
+        if hit is not None and (self._clock() - hit[0]) < ttl:
+            return hit
+        return None
+
+    def put(self, key: str, value: Any) -> Any:
+        self._rows[key] = (self._clock(), value)
+        return value
+
+    def clear(self) -> None:
+        self._rows.clear()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+# Parsed OpenF1 responses behind the standings build, keyed by endpoint+params.
+OPENF1_JSON = TTLCache()
+# The last computed (current, previous) standings pair, under the key "pair".
+STANDINGS_PAIR = TTLCache()
+
+
+def clear_standings_caches() -> None:
+    """Forget every cached standings input so the next build refetches."""
+    OPENF1_JSON.clear()
+    STANDINGS_PAIR.clear()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import unittest
+
+import standings_cache as sc
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class StandingsCacheTests(unittest.TestCase):
+    def test_hit_within_ttl(self) -> None:
+        clock = _Clock()
+        cache = sc.TTLCache(clock=clock)
+        data = [{"driver_number": 1, "points": 25}]
+        self.assertIs(cache.put("drivers_championship?{}", data), data)
+        clock.now += 59
+        hit = cache.get("drivers_championship?{}", 60)
+        self.assertIsNotNone(hit)
+        self.assertIs(hit[1], data)
+        self.assertIsNone(cache.get("sessions?{}", 60))
+
+    def test_entry_expires_after_ttl(self) -> None:
+        clock = _Clock()
+        cache = sc.TTLCache(clock=clock)
+        cache.put("pair", ([], []))
+        clock.now += 60
+        self.assertIsNone(cache.get("pair", 60))
+        self.assertIsNotNone(cache.get("pair", 61))
+        self.assertIsNone(cache.get("pair", 0))
+
+    def test_clear_standings_caches_empties_both(self) -> None:
+        sc.OPENF1_JSON.put("drivers_championship?{}", [{"driver_number": 1}])
+        sc.STANDINGS_PAIR.put("pair", ([{"driver_number": 1}], []))
+        sc.clear_standings_caches()
+        self.assertEqual(len(sc.OPENF1_JSON), 0)
+        self.assertEqual(len(sc.STANDINGS_PAIR), 0)
+        self.assertIsNone(sc.OPENF1_JSON.get("drivers_championship?{}", 60))
+        self.assertIsNone(sc.STANDINGS_PAIR.get("pair", 60))
+
+
+if __name__ == "__main__":
+    unittest.main()